@@ -9,10 +9,12 @@ __all__ = ["__version__"]
 
 def _read_version_from_pyproject() -> str | None:
     pyproject_path = Path(__file__).resolve().parents[2] / "pyproject.toml"
-    if not pyproject_path.exists():
+    try:
+        with pyproject_path.open("rb") as handle:
+            data = tomllib.load(handle)
+    except FileNotFoundError:
         return None
 
-    data = tomllib.loads(pyproject_path.read_text(encoding="utf-8"))
     project = data.get("project", {})
     version = project.get("version")
     if not version:
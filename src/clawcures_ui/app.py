@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import time
 import traceback
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
@@ -29,9 +29,20 @@ _ROLE_ADMIN = "admin"
 _JOBS_STREAM_POLL_SECONDS = 1.0
 _SSE_KEEPALIVE_SECONDS = 15.0
 _SSE_RETRY_MILLISECONDS = 3000
+_DEFAULT_JOB_WAIT_SECONDS = 10.0
+_MAX_JOB_WAIT_SECONDS = 30.0
 _JOB_RECOVERY_REASON = (
     "Studio restarted; previous in-memory job execution was interrupted."
 )
+# Completed jobs feed the promising-drugs portfolio, so only these are pruned.
+_PRUNABLE_JOB_STATUSES = ("failed", "cancelled")
+# json.dumps() builds a fresh encoder whenever non-default options are passed.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"))
+_SORTED_JSON_ENCODER = json.JSONEncoder(
+    ensure_ascii=True,
+    separators=(",", ":"),
+    sort_keys=True,
+)
 
 
 def _utc_now_iso() -> str:
@@ -68,11 +79,18 @@ class StudioApp:
         self.config.data_dir.mkdir(parents=True, exist_ok=True)
         self.store = JobStore(config.database_path)
         self._static_cache: dict[str, tuple[int, bytes, str]] = {}
+        self._examples_body: bytes | None = None
         self._jobs_stream_cache: dict[
             tuple[int, tuple[str, ...] | None],
             tuple[int, dict[str, Any], str],
         ] = {}
         self.store.recover_interrupted_jobs(reason=_JOB_RECOVERY_REASON)
+        if config.job_retention_days > 0:
+            cutoff = datetime.now(UTC) - timedelta(days=config.job_retention_days)
+            self.store.prune_jobs(
+                statuses=_PRUNABLE_JOB_STATUSES,
+                updated_before=cutoff.isoformat(),
+            )
         self.runner = BackgroundRunner(self.store, max_workers=config.max_workers)
         self.bridge = CampaignBridge(config.resolved_workspace_root)
         self.discovery_service: ContinuousDiscoveryService | None = None
@@ -91,6 +109,73 @@ class StudioApp:
         self.bridge.shutdown()
         self.store.shutdown()
 
+    def prewarm(self) -> None:
+        """Populate the bridge and static-asset caches ahead of the first request."""
+        self.bridge.available_tools()
+        self.bridge.default_objective()
+        self.examples_body()
+        for request_path in ("/", "/assets/app.js", "/assets/styles.css"):
+            self.load_static_asset(request_path)
+
+    def dispatch(
+        self,
+        method: str,
+        target: str,
+        body: bytes = b"",
+    ) -> tuple[int, dict[str, Any]]:
+        """Route one JSON API request in-process and return (status, payload)."""
+        try:
+            return HTTPStatus.OK, self._route_json(method, target, body)
+        except ApiError as exc:
+            return exc.status_code, {"error": exc.message}
+        except Exception as exc:  # noqa: BLE001
+            payload = {"error": str(exc), "type": type(exc).__name__}
+            if method == "POST":
+                payload["traceback"] = traceback.format_exc(limit=6)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, payload
+
+    def _route_json(self, method: str, target: str, body: bytes) -> dict[str, Any]:
+        parsed = urlparse(target)
+        path = parsed.path
+        if method == "GET":
+            query = parse_qs(parsed.query, keep_blank_values=False)
+            if path == "/api/health":
+                return self.health()
+            if path == "/api/examples":
+                return self.examples_payload()
+            if path == "/api/ecosystem":
+                return self.ecosystem_payload()
+            if path == "/api/jobs":
+                return self.list_jobs(query=query)
+            if path == "/api/promising-drugs":
+                return self.list_promising_drugs(query=query)
+            if path.startswith("/api/jobs/"):
+                return self.get_job(path.removeprefix("/api/jobs/"), query=query)
+            raise NotFoundError("unknown endpoint")
+
+        if method == "POST":
+            payload = _parse_json_body(body)
+            if path == "/api/plan":
+                return self.plan(payload)
+            if path == "/api/run":
+                return self.run(payload)
+            if path == "/api/plan/execute":
+                return self.execute_plan(payload)
+            if path == "/api/plan/validate":
+                return self.validate_plan(payload)
+            if path == "/api/jobs/clear":
+                return self.clear_jobs(payload)
+            if path.startswith("/api/jobs/") and path.endswith("/cancel"):
+                job_id = (
+                    path.removeprefix("/api/jobs/").removesuffix("/cancel").strip("/")
+                )
+                if not job_id:
+                    raise BadRequestError("job_id is required")
+                return self.cancel_job(job_id)
+            raise NotFoundError("unknown endpoint")
+
+        raise NotFoundError("unknown endpoint")
+
     def health(self) -> dict[str, Any]:
         tools, warnings = self.bridge.available_tools()
         return {
@@ -103,6 +188,15 @@ class StudioApp:
     def examples_payload(self) -> dict[str, Any]:
         return self.bridge.examples()
 
+    def examples_body(self) -> bytes:
+        # The examples payload is fixed for the process lifetime, so it is
+        # encoded once and served as-is.
+        body = self._examples_body
+        if body is None:
+            body = _JSON_ENCODER.encode(self.examples_payload()).encode("utf-8")
+            self._examples_body = body
+        return body
+
     def ecosystem_payload(self) -> dict[str, Any]:
         return self.bridge.ecosystem()
 
@@ -218,8 +312,19 @@ class StudioApp:
         self._static_cache[request_path] = payload
         return payload[1], payload[2]
 
-    def get_job(self, job_id: str) -> dict[str, Any]:
-        job = self.store.get_job(job_id)
+    def get_job(
+        self,
+        job_id: str,
+        *,
+        query: dict[str, list[str]] | None = None,
+    ) -> dict[str, Any]:
+        wait_for = _parse_statuses_query(query, name="wait_for") if query else None
+        if wait_for:
+            job = self.store.wait_for_job(
+                job_id, statuses=wait_for, timeout=_parse_timeout_query(query)
+            )
+        else:
+            job = self.store.get_job(job_id)
         if job is None:
             raise NotFoundError(f"Unknown job_id: {job_id}")
         job["events"] = self.store.list_events(job_id=job_id, limit=80)
@@ -356,12 +461,16 @@ class StudioApp:
         )
 
 
-def _parse_statuses_query(query: dict[str, list[str]]) -> tuple[str, ...] | None:
-    if "status" not in query:
+def _parse_statuses_query(
+    query: dict[str, list[str]],
+    *,
+    name: str = "status",
+) -> tuple[str, ...] | None:
+    if name not in query:
         return None
 
     status_items: list[str] = []
-    for raw in query.get("status", []):
+    for raw in query.get(name, []):
         for token in raw.split(","):
             normalized = token.strip()
             if normalized:
@@ -400,6 +509,16 @@ def _parse_limit_query(
         raise BadRequestError("Query parameter 'limit' must be an integer") from exc
 
 
+def _parse_timeout_query(query: dict[str, list[str]]) -> float:
+    if "timeout" not in query:
+        return _DEFAULT_JOB_WAIT_SECONDS
+    try:
+        timeout = float(query["timeout"][0])
+    except (TypeError, ValueError, IndexError) as exc:
+        raise BadRequestError("Query parameter 'timeout' must be a number") from exc
+    return min(max(timeout, 0.0), _MAX_JOB_WAIT_SECONDS)
+
+
 def _require_nonempty_string(value: Any, field_name: str) -> str:
     if not isinstance(value, str):
         raise BadRequestError(f"{field_name} must be a string")
@@ -429,17 +548,19 @@ def _coerce_int(value: Any, field_name: str, *, minimum: int = 0) -> int:
 
 
 def _json_response(
-    handler: BaseHTTPRequestHandler, status: int, payload: dict[str, Any]
+    handler: BaseHTTPRequestHandler,
+    status: int,
+    payload: dict[str, Any],
+    *,
+    close_connection: bool = False,
 ) -> None:
-    body = json.dumps(
-        payload,
-        ensure_ascii=True,
-        separators=(",", ":"),
-    ).encode("utf-8")
+    body = _JSON_ENCODER.encode(payload).encode("utf-8")
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json; charset=utf-8")
     handler.send_header("Content-Length", str(len(body)))
     handler.send_header("Cache-Control", "no-store")
+    if close_connection:
+        handler.send_header("Connection", "close")
     handler.end_headers()
     handler.wfile.write(body)
 
@@ -483,7 +604,7 @@ def _write_sse_event(
         lines.append(f"id: {event_id}")
     if event:
         lines.append(f"event: {event}")
-    payload = json.dumps(data, ensure_ascii=True, separators=(",", ":"), sort_keys=True)
+    payload = _SORTED_JSON_ENCODER.encode(data)
     lines.append(f"data: {payload}")
     body = ("\n".join(lines) + "\n\n").encode("utf-8")
     handler.wfile.write(body)
@@ -584,15 +705,10 @@ def _jobs_stream_signature(payload: dict[str, Any]) -> str:
         "jobs": normalized_jobs,
         "events": normalized_events,
     }
-    return json.dumps(
-        normalized_payload,
-        ensure_ascii=True,
-        separators=(",", ":"),
-        sort_keys=True,
-    )
+    return _SORTED_JSON_ENCODER.encode(normalized_payload)
 
 
-def _read_json_body(handler: BaseHTTPRequestHandler) -> dict[str, Any]:
+def _read_request_body(handler: BaseHTTPRequestHandler) -> bytes:
     length_raw = handler.headers.get("Content-Length", "")
     try:
         length = int(length_raw)
@@ -600,12 +716,16 @@ def _read_json_body(handler: BaseHTTPRequestHandler) -> dict[str, Any]:
         raise BadRequestError("Invalid Content-Length header") from exc
 
     if length <= 0:
-        return {}
+        return b""
+    return handler.rfile.read(length)
+
 
-    raw = handler.rfile.read(length)
+def _parse_json_body(raw: bytes) -> dict[str, Any]:
+    if not raw:
+        return {}
     try:
         parsed = json.loads(raw.decode("utf-8"))
-    except json.JSONDecodeError as exc:
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
         raise BadRequestError("Request body must be valid JSON") from exc
 
     if not isinstance(parsed, dict):
@@ -684,7 +804,7 @@ def _authorize_request(
             {"error": "Missing bearer token.", "required_role": required_role},
         )
 
-    token_roles = app.config.roles_for_token(token)
+    token_roles = app.config.verify_token(token)
     if not token_roles:
         return (
             HTTPStatus.UNAUTHORIZED,
@@ -706,6 +826,7 @@ def _authorize_request(
 def create_handler(app: StudioApp):
     class StudioHandler(BaseHTTPRequestHandler):
         protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
 
         def log_message(self, _format: str, *_args: Any) -> None:  # noqa: D401
             return
@@ -721,19 +842,6 @@ def create_handler(app: StudioApp):
                     _json_response(self, status, payload)
                     return
 
-                if path == "/api/health":
-                    _json_response(self, HTTPStatus.OK, app.health())
-                    return
-                if path == "/api/examples":
-                    _json_response(self, HTTPStatus.OK, app.examples_payload())
-                    return
-                if path == "/api/ecosystem":
-                    _json_response(self, HTTPStatus.OK, app.ecosystem_payload())
-                    return
-                if path == "/api/jobs":
-                    query = parse_qs(parsed.query, keep_blank_values=False)
-                    _json_response(self, HTTPStatus.OK, app.list_jobs(query=query))
-                    return
                 if path == "/api/jobs/stream":
                     query = parse_qs(parsed.query, keep_blank_values=False)
                     try:
@@ -747,12 +855,6 @@ def create_handler(app: StudioApp):
                     ):
                         return
                     return
-                if path == "/api/promising-drugs":
-                    query = parse_qs(parsed.query, keep_blank_values=False)
-                    _json_response(
-                        self, HTTPStatus.OK, app.list_promising_drugs(query=query)
-                    )
-                    return
                 if path == "/structures/file":
                     query = parse_qs(parsed.query, keep_blank_values=False)
                     path_value = query.get("path", [""])[0]
@@ -766,14 +868,17 @@ def create_handler(app: StudioApp):
                         data=data,
                     )
                     return
-                if path.startswith("/api/jobs/"):
-                    job_id = path.removeprefix("/api/jobs/")
-                    _json_response(self, HTTPStatus.OK, app.get_job(job_id))
+                if path == "/api/examples":
+                    _text_response(
+                        self,
+                        status=HTTPStatus.OK,
+                        content_type="application/json; charset=utf-8",
+                        data=app.examples_body(),
+                    )
                     return
                 if path.startswith("/api/"):
-                    _json_response(
-                        self, HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"}
-                    )
+                    status, payload = app.dispatch("GET", self.path)
+                    _json_response(self, status, payload)
                     return
 
                 static_payload = app.load_static_asset(path)
@@ -818,43 +923,14 @@ def create_handler(app: StudioApp):
                 auth_failure = _authorize_request(self, app, method="POST", path=path)
                 if auth_failure is not None:
                     status, payload = auth_failure
-                    _json_response(self, status, payload)
-                    return
-
-                payload = _read_json_body(self)
-
-                if path == "/api/plan":
-                    _json_response(self, HTTPStatus.OK, app.plan(payload))
-                    return
-                if path == "/api/run":
-                    _json_response(self, HTTPStatus.OK, app.run(payload))
-                    return
-                if path == "/api/plan/execute":
-                    _json_response(self, HTTPStatus.OK, app.execute_plan(payload))
-                    return
-                if path == "/api/plan/validate":
-                    _json_response(self, HTTPStatus.OK, app.validate_plan(payload))
-                    return
-                if path == "/api/jobs/clear":
-                    _json_response(self, HTTPStatus.OK, app.clear_jobs(payload))
-                    return
-                if path.startswith("/api/jobs/") and path.endswith("/cancel"):
-                    job_id = (
-                        path.removeprefix("/api/jobs/")
-                        .removesuffix("/cancel")
-                        .strip("/")
-                    )
-                    if not job_id:
-                        raise BadRequestError("job_id is required")
-                    _json_response(self, HTTPStatus.OK, app.cancel_job(job_id))
-                    return
-                if path.startswith("/api/"):
-                    _json_response(
-                        self, HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"}
-                    )
+                    # The unread request body would corrupt a kept-alive
+                    # connection, so reject and close instead of draining it.
+                    _json_response(self, status, payload, close_connection=True)
                     return
 
-                _json_response(self, HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"})
+                body = _read_request_body(self)
+                status, payload = app.dispatch("POST", self.path, body)
+                _json_response(self, status, payload)
             except ApiError as exc:
                 _json_response(self, exc.status_code, {"error": exc.message})
             except Exception as exc:  # noqa: BLE001
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import functools
 import importlib
 import json
+import os
 import sys
 import threading
+import time
 from dataclasses import asdict, is_dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-STATIC_TOOL_LIST = [
+STATIC_TOOL_LIST: tuple[str, ...] = (
     "refua_validate_spec",
     "refua_fold",
     "refua_affinity",
@@ -22,7 +25,11 @@ STATIC_TOOL_LIST = [
     "refua_data_query",
     "refua_job",
     "refua_admet_profile",
-]
+)
+_STATIC_TOOL_SET = frozenset(STATIC_TOOL_LIST)
+_INSERTED_PATHS: set[str] = set()
+
+_ADAPTER_ERROR_RETRY_SECONDS = 30.0
 
 _DEFAULT_CLAWCURES_OBJECTIVE = (
     "Find cures for all diseases by prioritizing the highest-burden conditions and "
@@ -90,8 +97,10 @@ class StudioBridgeError(RuntimeError):
 
 
 class _StaticToolAdapter:
+    __slots__ = ("_tool_names",)
+
     def __init__(self, tool_names: list[str] | tuple[str, ...] | None = None) -> None:
-        self._tool_names = list(tool_names) if tool_names else list(STATIC_TOOL_LIST)
+        self._tool_names = tuple(tool_names) if tool_names else STATIC_TOOL_LIST
 
     def available_tools(self) -> list[str]:
         return list(self._tool_names)
@@ -102,20 +111,92 @@ class _StaticToolAdapter:
         )
 
 
+@functools.lru_cache(maxsize=4)
+def _prompt_preview(text: str) -> tuple[str, int]:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return "\n".join(lines[:6]), len(lines)
+
+
+def _dump_model(value: Any) -> Any:
+    return value.model_dump(mode="json")
+
+
+def _resolve_plain_serializer(value_type: type) -> Callable[[Any], Any] | None:
+    if issubclass(value_type, Path):
+        return str
+    if callable(getattr(value_type, "model_dump", None)):
+        return _dump_model
+    if is_dataclass(value_type):
+        return asdict
+    return None
+
+
+_PLAIN_SERIALIZER_CACHE: dict[type, Callable[[Any], Any] | None] = {}
+_PLAIN_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _to_plain_leaf(value: Any) -> Any:
+    value_type = type(value)
+    try:
+        serializer = _PLAIN_SERIALIZER_CACHE[value_type]
+    except KeyError:
+        serializer = _resolve_plain_serializer(value_type)
+        _PLAIN_SERIALIZER_CACHE[value_type] = serializer
+    if serializer is None:
+        return value
+    return serializer(value)
+
+
 def _to_plain_data(value: Any) -> Any:
-    if isinstance(value, Path):
-        return str(value)
-    if hasattr(value, "model_dump"):
-        return value.model_dump(mode="json")
-    if is_dataclass(value):
-        return asdict(value)
-    if isinstance(value, dict):
-        return {str(key): _to_plain_data(item) for key, item in value.items()}
-    if isinstance(value, list):
-        return [_to_plain_data(item) for item in value]
-    if isinstance(value, tuple):
-        return [_to_plain_data(item) for item in value]
-    return value
+    root: list[Any] = [None]
+    # Explicit work stack of (container, key, value) so deep payloads never recurse.
+    stack: list[tuple[Any, Any, Any]] = [(root, 0, value)]
+    scalar_types = _PLAIN_SCALAR_TYPES
+    while stack:
+        container, key, item = stack.pop()
+        if type(item) in scalar_types:
+            container[key] = item
+        elif isinstance(item, dict):
+            converted = dict.fromkeys(str(item_key) for item_key in item)
+            container[key] = converted
+            # Push in reverse so later duplicate keys (e.g. 1 and "1") still win.
+            stack.extend(
+                (converted, str(item_key), item_value)
+                for item_key, item_value in reversed(item.items())
+            )
+        elif isinstance(item, (list, tuple)):
+            converted_items: list[Any] = [None] * len(item)
+            container[key] = converted_items
+            stack.extend(
+                (converted_items, index, item_value)
+                for index, item_value in enumerate(item)
+            )
+        else:
+            container[key] = _to_plain_leaf(item)
+    return root[0]
+
+
+def _serialize_results(results: list[Any]) -> list[dict[str, Any]]:
+    to_plain = _to_plain_data
+    return [
+        {
+            "tool": getattr(item, "tool", None),
+            "args": to_plain(getattr(item, "args", None)),
+            "output": to_plain(getattr(item, "output", None)),
+        }
+        for item in results
+    ]
+
+
+def _merge_execution_payload(
+    payload: dict[str, Any], execution_payload: dict[str, Any]
+) -> None:
+    payload["results"] = execution_payload["results"]
+    payload["promising_cures"] = execution_payload["promising_cures"]
+    if "promising_cures_summary" in execution_payload:
+        payload["promising_cures_summary"] = execution_payload["promising_cures_summary"]
+    if "warnings" in execution_payload:
+        payload.setdefault("warnings", []).extend(execution_payload["warnings"])
 
 
 class CampaignBridge:
@@ -126,7 +207,9 @@ class CampaignBridge:
         self._paths_ready = False
         self._cache_lock = threading.Lock()
         self._module_cache: dict[str, Any] = {}
+        self._importable_cache: dict[str, bool] = {}
         self._adapter_cache: tuple[Any, str | None] | None = None
+        self._adapter_cached_at = 0.0
         self._available_tools_cache: tuple[tuple[str, ...], tuple[str, ...]] | None = None
         self._planner_tool_allowlist_cache: tuple[str, ...] | None = None
         self._clawcures_defaults_cache: tuple[dict[str, Any], tuple[str, ...]] | None = None
@@ -138,6 +221,7 @@ class CampaignBridge:
     def _ensure_paths(self) -> None:
         if self._paths_ready:
             return
+        known_paths = set(sys.path)
         for relative in (
             ("ClawCures", "src"),
             ("clawcures-ui", "src"),
@@ -148,18 +232,22 @@ class CampaignBridge:
             ("refua-data", "src"),
         ):
             candidate = self._workspace_root.joinpath(*relative)
-            if candidate.exists():
-                candidate_text = str(candidate)
-                if candidate_text not in sys.path:
+            candidate_text = str(candidate)
+            if candidate_text in _INSERTED_PATHS:
+                continue
+            if candidate.is_dir():
+                if candidate_text not in known_paths:
                     sys.path.insert(0, candidate_text)
+                    known_paths.add(candidate_text)
+                _INSERTED_PATHS.add(candidate_text)
         self._paths_ready = True
 
     def _import(self, module_name: str) -> Any:
-        self._ensure_paths()
-        with self._cache_lock:
-            cached = self._module_cache.get(module_name)
+        # Plain dict reads are atomic; only the miss path needs the lock.
+        cached = self._module_cache.get(module_name)
         if cached is not None:
             return cached
+        self._ensure_paths()
         module = importlib.import_module(module_name)
         with self._cache_lock:
             self._module_cache[module_name] = module
@@ -194,26 +282,40 @@ class CampaignBridge:
             self._system_prompt_cache = (mtime_ns, prompt_text)
         return prompt_text
 
+    def invalidate_adapter(self) -> None:
+        with self._cache_lock:
+            self._adapter_cache = None
+            self._available_tools_cache = None
+            self._planner_tool_allowlist_cache = None
+
     def _build_adapter(self) -> tuple[Any, str | None]:
         with self._cache_lock:
             cached = self._adapter_cache
+            cached_at = self._adapter_cached_at
         if cached is not None:
-            return cached
+            if (
+                cached[1] is None
+                or time.monotonic() - cached_at < _ADAPTER_ERROR_RETRY_SECONDS
+            ):
+                return cached
+            # Adapter setup failed a while ago; retry in case the runtime is now available.
+            self.invalidate_adapter()
 
-        fallback_tools = list(STATIC_TOOL_LIST)
+        fallback_tools: tuple[str, ...] = STATIC_TOOL_LIST
         try:
             adapter_mod = self._import("refua_campaign.refua_mcp_adapter")
             adapter_fallback = getattr(adapter_mod, "DEFAULT_TOOL_LIST", None)
             if isinstance(adapter_fallback, (list, tuple)) and all(
                 isinstance(item, str) for item in adapter_fallback
             ):
-                fallback_tools = list(adapter_fallback)
+                fallback_tools = tuple(adapter_fallback)
             adapter = adapter_mod.RefuaMcpAdapter()
             result = (adapter, None)
         except Exception as exc:  # noqa: BLE001
             result = (_StaticToolAdapter(fallback_tools), str(exc))
         with self._cache_lock:
             self._adapter_cache = result
+            self._adapter_cached_at = time.monotonic()
         return result
 
     def _planner_tool_allowlist(self) -> list[str]:
@@ -256,18 +358,6 @@ class CampaignBridge:
         except Exception as exc:  # noqa: BLE001
             return None, f"Failed reading {path}: {exc}"
 
-    def _serialize_results(self, results: list[Any]) -> list[dict[str, Any]]:
-        payload: list[dict[str, Any]] = []
-        for item in results:
-            payload.append(
-                {
-                    "tool": getattr(item, "tool", None),
-                    "args": _to_plain_data(getattr(item, "args", None)),
-                    "output": _to_plain_data(getattr(item, "output", None)),
-                }
-            )
-        return payload
-
     def _summarize_event_value(self, value: Any, *, limit: int = 140) -> str | None:
         if value is None:
             return None
@@ -355,17 +445,43 @@ class CampaignBridge:
         except Exception as exc:  # noqa: BLE001
             return [], None, str(exc)
 
-    def _load_product_status(self, descriptor: dict[str, str]) -> dict[str, Any]:
-        repo_dir = self._workspace_root / descriptor["repo"]
-        module_name = descriptor.get("module", "")
-        imported = False
-        if module_name:
+    def _is_importable(self, module_name: str) -> bool:
+        with self._cache_lock:
+            cached = self._importable_cache.get(module_name)
+        if cached is not None:
+            return cached
+        if module_name in sys.modules:
+            imported = True
+        else:
             self._ensure_paths()
             try:
                 imported = importlib.util.find_spec(module_name) is not None
             except Exception:
                 imported = False
-        exists = repo_dir.exists()
+        with self._cache_lock:
+            self._importable_cache[module_name] = imported
+        return imported
+
+    def _workspace_entries(self) -> dict[str, os.DirEntry[str]]:
+        try:
+            with os.scandir(self._workspace_root) as entries:
+                return {entry.name: entry for entry in entries}
+        except OSError:
+            return {}
+
+    def _load_product_status(
+        self,
+        descriptor: dict[str, str],
+        entries: dict[str, os.DirEntry[str]],
+    ) -> dict[str, Any]:
+        repo_dir = self._workspace_root / descriptor["repo"]
+        module_name = descriptor.get("module", "")
+        imported = self._is_importable(module_name) if module_name else False
+        entry = entries.get(descriptor["repo"])
+        try:
+            exists = entry is not None and entry.is_dir()
+        except OSError:
+            exists = False
         health = "healthy" if exists and imported else "degraded" if exists else "missing"
         return {
             "id": descriptor["id"],
@@ -404,14 +520,12 @@ class CampaignBridge:
                 warnings.append(read_error)
                 prompt_text = ""
 
-        prompt_lines = [
-            line.strip() for line in prompt_text.splitlines() if line.strip()
-        ]
+        prompt_preview, prompt_line_count = _prompt_preview(prompt_text)
         defaults = {
             "default_objective": objective,
             "default_prompt_path": str(prompt_path),
-            "default_prompt_preview": "\n".join(prompt_lines[:6]),
-            "default_prompt_line_count": len(prompt_lines),
+            "default_prompt_preview": prompt_preview,
+            "default_prompt_line_count": prompt_line_count,
             "tool_allowlist": self._planner_tool_allowlist(),
         }
         with self._cache_lock:
@@ -426,14 +540,21 @@ class CampaignBridge:
         return _DEFAULT_CLAWCURES_OBJECTIVE
 
     def examples(self) -> dict[str, Any]:
+        # The objectives tuple is shared module state; callers must treat it as read-only.
         return {
-            "objectives": list(_DEFAULT_OBJECTIVES),
+            "objectives": _DEFAULT_OBJECTIVES,
             "warnings": [],
         }
 
     def available_tools(self) -> tuple[list[str], list[str]]:
         with self._cache_lock:
             cached = self._available_tools_cache
+        if cached is not None and cached[1]:
+            # A fallback list shares the failed adapter's retry window;
+            # _build_adapter drops it once that window has passed.
+            self._build_adapter()
+            with self._cache_lock:
+                cached = self._available_tools_cache
         if cached is not None:
             tool_names, warnings = cached
             return list(tool_names), list(warnings)
@@ -445,15 +566,17 @@ class CampaignBridge:
                 "Falling back to static tool list because refua-mcp runtime is unavailable: "
                 f"{error}"
             )
-        tool_names = tuple(sorted(set(adapter.available_tools()) | set(STATIC_TOOL_LIST)))
+        tool_names = tuple(sorted(_STATIC_TOOL_SET.union(adapter.available_tools())))
         with self._cache_lock:
             self._available_tools_cache = (tool_names, tuple(warnings))
         return list(tool_names), warnings
 
     def ecosystem(self) -> dict[str, Any]:
         clawcures_defaults, warnings = self._clawcures_defaults()
+        entries = self._workspace_entries()
         products = [
-            self._load_product_status(descriptor) for descriptor in _PRODUCT_REGISTRY
+            self._load_product_status(descriptor, entries)
+            for descriptor in _PRODUCT_REGISTRY
         ]
         return {
             "generated_at": datetime.now(UTC).isoformat(),
@@ -500,6 +623,19 @@ class CampaignBridge:
         plan: dict[str, Any],
         event_callback: Any = None,
     ) -> dict[str, Any]:
+        return self._execute_plan(
+            plan=plan, event_callback=event_callback, plan_is_plain=False
+        )
+
+    def _execute_plan(
+        self,
+        *,
+        plan: dict[str, Any],
+        event_callback: Any,
+        plan_is_plain: bool,
+    ) -> dict[str, Any]:
+        # plan_is_plain is only set by the _run_* helpers, which pass a plan
+        # they have already normalized (and therefore copied) themselves.
         if not isinstance(plan, dict):
             raise ValueError("plan must be a JSON object")
 
@@ -586,7 +722,7 @@ class CampaignBridge:
             )
 
         try:
-            results = self._serialize_results(
+            results = _serialize_results(
                 adapter.execute_plan(plan, event_callback=_adapter_event)
             )
         except Exception as exc:
@@ -608,7 +744,7 @@ class CampaignBridge:
             results
         )
         payload: dict[str, Any] = {
-            "plan": _to_plain_data(plan),
+            "plan": plan if plan_is_plain else _to_plain_data(plan),
             "results": results,
             "promising_cures": cures,
         }
@@ -689,6 +825,12 @@ class CampaignBridge:
         if plan is not None and not isinstance(plan, dict):
             raise ValueError("plan must be a JSON object")
 
+        if not dry_run:
+            # Fail before planning when execution cannot happen anyway.
+            _adapter, adapter_error = self._build_adapter()
+            if adapter_error is not None:
+                raise StudioBridgeError(adapter_error)
+
         resolved_prompt = system_prompt or self._default_system_prompt()
 
         payload: dict[str, Any] = {
@@ -698,34 +840,29 @@ class CampaignBridge:
         }
 
         if plan is not None:
-            resolved_plan = plan
+            resolved_plan = _to_plain_data(plan)
             payload["planner_response_text"] = "Loaded from request"
         else:
             planner_payload = self.plan(
                 objective=objective_text,
                 system_prompt=resolved_prompt,
             )
+            # plan() already returns plain data.
             resolved_plan = planner_payload["plan"]
             payload["planner_response_text"] = planner_payload["planner_response_text"]
             if "warnings" in planner_payload:
                 payload["warnings"] = list(planner_payload["warnings"])
 
-        payload["plan"] = _to_plain_data(resolved_plan)
+        payload["plan"] = resolved_plan
         if dry_run:
             return payload
 
-        execution_payload = self.execute_plan(
+        execution_payload = self._execute_plan(
             plan=resolved_plan,
             event_callback=event_callback,
+            plan_is_plain=True,
         )
-        payload["results"] = execution_payload["results"]
-        payload["promising_cures"] = execution_payload["promising_cures"]
-        if "promising_cures_summary" in execution_payload:
-            payload["promising_cures_summary"] = execution_payload[
-                "promising_cures_summary"
-            ]
-        if "warnings" in execution_payload:
-            payload.setdefault("warnings", []).extend(execution_payload["warnings"])
+        _merge_execution_payload(payload, execution_payload)
         return payload
 
     def _run_autonomous(
@@ -744,11 +881,18 @@ class CampaignBridge:
         if not objective_text:
             raise ValueError("objective must be a non-empty string")
 
+        if plan is not None and not isinstance(plan, dict):
+            raise ValueError("plan must be a JSON object")
+
+        adapter, adapter_error = self._build_adapter()
+        if not dry_run and adapter_error is not None:
+            # Fail before planning when execution cannot happen anyway.
+            raise StudioBridgeError(adapter_error)
+
         autonomy_mod = self._import("refua_campaign.autonomy")
         openclaw_mod = self._import("refua_campaign.openclaw_client")
         config_mod = self._import("refua_campaign.config")
 
-        adapter, adapter_error = self._build_adapter()
         tools = self._planner_tool_allowlist()
         policy = autonomy_mod.PlanPolicy(
             max_calls=int(max_calls),
@@ -757,8 +901,6 @@ class CampaignBridge:
         resolved_prompt = system_prompt or self._default_system_prompt()
 
         if plan is not None:
-            if not isinstance(plan, dict):
-                raise ValueError("plan must be a JSON object")
             policy_check = autonomy_mod.evaluate_plan_policy(
                 plan,
                 allowed_tools=tools,
@@ -799,27 +941,18 @@ class CampaignBridge:
         if dry_run or not bool(payload.get("approved", False)):
             return payload
 
-        if adapter_error is not None:
-            raise StudioBridgeError(adapter_error)
-
         final_plan = payload.get("final_plan")
         if not isinstance(final_plan, dict):
             raise StudioBridgeError(
                 "Autonomous planner did not produce a valid final_plan."
             )
 
-        execution_payload = self.execute_plan(
+        execution_payload = self._execute_plan(
             plan=final_plan,
             event_callback=event_callback,
+            plan_is_plain=True,
         )
-        payload["results"] = execution_payload["results"]
-        payload["promising_cures"] = execution_payload["promising_cures"]
-        if "promising_cures_summary" in execution_payload:
-            payload["promising_cures_summary"] = execution_payload[
-                "promising_cures_summary"
-            ]
-        if "warnings" in execution_payload:
-            payload.setdefault("warnings", []).extend(execution_payload["warnings"])
+        _merge_execution_payload(payload, execution_payload)
         return payload
 
     def validate_plan(
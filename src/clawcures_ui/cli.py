@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import os
+import threading
 import webbrowser
 from pathlib import Path
 
@@ -38,6 +39,15 @@ def build_parser() -> argparse.ArgumentParser:
         default=2,
         help="Max background workers for jobs",
     )
+    parser.add_argument(
+        "--job-retention-days",
+        type=float,
+        default=0.0,
+        help=(
+            "Delete failed and cancelled jobs older than this many days at startup. "
+            "Pruning is disabled unless this is set above 0."
+        ),
+    )
     parser.add_argument(
         "--no-autostart-agent",
         action="store_true",
@@ -108,6 +118,7 @@ def main(argv: list[str] | None = None) -> int:
         data_dir=args.data_dir,
         workspace_root=args.workspace_root,
         max_workers=max(1, int(args.max_workers)),
+        job_retention_days=max(0.0, float(args.job_retention_days)),
         autostart_agent=(
             False
             if bool(args.no_autostart_agent)
@@ -125,6 +136,9 @@ def main(argv: list[str] | None = None) -> int:
     )
 
     server, app = create_server(config)
+    threading.Thread(
+        target=app.prewarm, name="clawcures-ui-prewarm", daemon=True
+    ).start()
     host, port = server.server_address
     url = f"http://{host}:{port}"
     print(f"ClawCures UI listening on {url}")
@@ -154,31 +168,17 @@ def _resolve_tokens(
     *,
     env_names: tuple[str, ...],
 ) -> tuple[str, ...]:
-    combined: list[str] = []
-    for env_name in env_names:
-        env_raw = os.environ.get(env_name, "")
-        if env_raw.strip():
-            combined.extend(_parse_csv_tokens(env_raw))
+    raw_values = [os.environ.get(env_name, "") for env_name in env_names]
     if values:
-        for item in values:
-            combined.extend(_parse_csv_tokens(item))
-    deduped: list[str] = []
-    seen: set[str] = set()
-    for token in combined:
-        if token in seen:
-            continue
-        deduped.append(token)
-        seen.add(token)
-    return tuple(deduped)
-
-
-def _parse_csv_tokens(raw: str) -> list[str]:
-    tokens: list[str] = []
-    for piece in raw.split(","):
-        normalized = piece.strip()
-        if normalized:
-            tokens.append(normalized)
-    return tokens
+        raw_values.extend(values)
+    return tuple(
+        dict.fromkeys(
+            token
+            for raw in raw_values
+            for token in (piece.strip() for piece in raw.split(","))
+            if token
+        )
+    )
 
 
 def _resolve_bool_setting(
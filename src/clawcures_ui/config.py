@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import hmac
 from dataclasses import dataclass, field
 from pathlib import Path
 
 
 DEFAULT_DATA_DIR_NAME = ".clawcures-ui"
 LEGACY_DATA_DIR_NAME = ".refua-studio"
+_NO_ROLES: frozenset[str] = frozenset()
+_STATIC_DIR = Path(__file__).resolve().parent / "static"
 
 
 def default_data_dir() -> Path:
@@ -26,50 +29,67 @@ class StudioConfig:
     port: int = 8787
     data_dir: Path = field(default_factory=default_data_dir)
     max_workers: int = 2
+    job_retention_days: float = 0.0
     workspace_root: Path | None = None
     autostart_agent: bool = True
     auth_tokens: tuple[str, ...] = ()
     operator_tokens: tuple[str, ...] = ()
     admin_tokens: tuple[str, ...] = ()
+    _token_roles: dict[str, frozenset[str]] = field(
+        init=False, repr=False, compare=False
+    )
+    _database_path: Path = field(init=False, repr=False, compare=False)
+    _resolved_workspace_root: Path = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_database_path", self.data_dir / "studio.db")
+        if self.workspace_root is not None:
+            resolved_workspace_root = self.workspace_root.resolve()
+        else:
+            # src/clawcures_ui/config.py -> src -> clawcures-ui -> refua-project
+            resolved_workspace_root = Path(__file__).resolve().parents[3]
+        object.__setattr__(self, "_resolved_workspace_root", resolved_workspace_root)
+
+        token_roles: dict[str, set[str]] = {}
+        for tokens, granted in (
+            (self.auth_tokens, ("viewer",)),
+            (self.operator_tokens, ("viewer", "operator")),
+            (self.admin_tokens, ("viewer", "operator", "admin")),
+        ):
+            for item in tokens:
+                normalized = item.strip()
+                if normalized:
+                    token_roles.setdefault(normalized, set()).update(granted)
+        object.__setattr__(
+            self,
+            "_token_roles",
+            {token: frozenset(roles) for token, roles in token_roles.items()},
+        )
 
     @property
     def static_dir(self) -> Path:
-        return Path(__file__).resolve().parent / "static"
+        return _STATIC_DIR
 
     @property
     def database_path(self) -> Path:
-        return self.data_dir / "studio.db"
+        return self._database_path
 
     @property
     def resolved_workspace_root(self) -> Path:
-        if self.workspace_root is not None:
-            return self.workspace_root.resolve()
-        # src/clawcures_ui/config.py -> src -> clawcures-ui -> refua-project
-        return Path(__file__).resolve().parents[3]
+        return self._resolved_workspace_root
 
     @property
     def auth_enabled(self) -> bool:
-        return bool(self._all_tokens())
+        return bool(self._token_roles)
 
     def roles_for_token(self, token: str) -> frozenset[str]:
-        normalized = token.strip()
-        if not normalized:
-            return frozenset()
-        all_tokens = self._all_tokens()
-        if normalized not in all_tokens:
-            return frozenset()
-
-        roles = {"viewer"}
-        if normalized in set(self.operator_tokens):
-            roles.add("operator")
-        if normalized in set(self.admin_tokens):
-            roles.add("admin")
-            roles.add("operator")
-        return frozenset(roles)
-
-    def _all_tokens(self) -> frozenset[str]:
-        tokens: set[str] = set()
-        tokens.update(item.strip() for item in self.auth_tokens if item.strip())
-        tokens.update(item.strip() for item in self.operator_tokens if item.strip())
-        tokens.update(item.strip() for item in self.admin_tokens if item.strip())
-        return frozenset(tokens)
+        return self._token_roles.get(token.strip(), _NO_ROLES)
+
+    def verify_token(self, token: str) -> frozenset[str]:
+        candidate = token.strip().encode("utf-8")
+        matched = _NO_ROLES
+        # Compare against every configured token so timing does not reveal a prefix match.
+        for configured, roles in self._token_roles.items():
+            if hmac.compare_digest(configured.encode("utf-8"), candidate):
+                matched = roles
+        return matched
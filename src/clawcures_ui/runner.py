@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import inspect
 import threading
+import types
 from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable
 
@@ -20,7 +21,10 @@ class BackgroundRunner:
         self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
         self._futures: dict[str, Future[None]] = {}
         self._cancel_events: dict[str, threading.Event] = {}
-        self._lock = threading.Lock()
+        self._cancel_reasons: dict[str, str] = {}
+        self._hold_lock = threading.Lock()
+        self._paused = False
+        self._held: dict[str, Callable[[], None]] = {}
 
     def submit(
         self,
@@ -32,14 +36,13 @@ class BackgroundRunner:
         job = self._store.create_job(kind=kind, request=request)
         job_id = job["job_id"]
         cancel_event = threading.Event()
-        with self._lock:
-            self._cancel_events[job_id] = cancel_event
+        self._cancel_events[job_id] = cancel_event
 
         def _wrapped() -> None:
             # If cancel() succeeds before execution, this function is never called.
             if not self._store.set_running(job_id):
                 return
-            if cancel_event.is_set() or self._store.is_cancel_requested(job_id):
+            if cancel_event.is_set():
                 self._store.set_cancelled(job_id, "Cancelled by user before execution.")
                 return
             try:
@@ -50,93 +53,160 @@ class BackgroundRunner:
             except Exception as exc:  # noqa: BLE001
                 self._store.set_failed(job_id, str(exc))
                 return
-            if cancel_event.is_set() or self._store.is_cancel_requested(job_id):
+            if cancel_event.is_set():
                 self._store.set_cancelled(job_id, "Cancelled by user during execution.")
                 return
             self._store.set_completed(job_id, result)
 
-        future = self._executor.submit(_wrapped)
-        with self._lock:
-            self._futures[job_id] = future
+        with self._hold_lock:
+            if self._paused:
+                self._held[job_id] = _wrapped
+                return job
+        self._dispatch(job_id, _wrapped)
+        return job
+
+    def _dispatch(self, job_id: str, wrapped: Callable[[], None]) -> None:
+        future = self._executor.submit(wrapped)
+        # Single dict operations are atomic; the done callback is registered
+        # after the insert so it can never run before it.
+        self._futures[job_id] = future
 
         def _cleanup(done_future: Future[None]) -> None:
-            with self._lock:
-                self._futures.pop(job_id, None)
-                self._cancel_events.pop(job_id, None)
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+            reason = self._cancel_reasons.pop(job_id, "Cancelled before execution.")
+            # Only futures cancelled before _wrapped started need a status write;
+            # every other path has already recorded its terminal state.
             if done_future.cancelled():
-                self._store.set_cancelled(job_id, "Cancelled before execution.")
+                self._store.set_cancelled(job_id, reason)
 
         future.add_done_callback(_cleanup)
-        refreshed = self._store.get_job(job_id)
-        if refreshed is None:
-            raise RuntimeError("Submitted job cannot be found.")
-        return refreshed
+
+    def pause(self) -> None:
+        """Hold newly submitted jobs in the queued state until resume()."""
+        with self._hold_lock:
+            self._paused = True
+
+    def resume(self) -> None:
+        """Hand every held job to the executor in submission order."""
+        with self._hold_lock:
+            self._paused = False
+            held = list(self._held.items())
+            self._held.clear()
+        for job_id, wrapped in held:
+            self._dispatch(job_id, wrapped)
+
+    def is_queued(self, job_id: str) -> bool:
+        if job_id in self._held:
+            return True
+        future = self._futures.get(job_id)
+        return future is not None and not future.running() and not future.done()
 
     def cancel(self, job_id: str) -> dict[str, Any]:
-        job = self._store.get_job(job_id)
-        if job is None:
+        status = self._store.get_job_status(job_id)
+        if status is None:
             raise KeyError(job_id)
 
-        with self._lock:
-            future = self._futures.get(job_id)
-            cancel_event = self._cancel_events.get(job_id)
+        with self._hold_lock:
+            held = self._held.pop(job_id, None)
+        if held is not None:
+            self._cancel_events.pop(job_id, None)
+            self._store.set_cancelled(job_id, "Cancelled by user before execution.")
+            return {
+                "job_id": job_id,
+                "cancelled": True,
+                "status": "cancelled",
+                "message": "Job cancelled.",
+            }
+
+        future = self._futures.get(job_id)
+        cancel_event = self._cancel_events.get(job_id)
 
         if future is None:
             return {
                 "job_id": job_id,
                 "cancelled": False,
-                "status": job["status"],
+                "status": status,
                 "message": "Job is not active.",
             }
 
-        if job["status"] == "queued":
+        if status == "queued":
+            # The done callback records the cancellation with this reason.
+            self._cancel_reasons[job_id] = "Cancelled by user before execution."
             cancelled = future.cancel()
             if cancelled:
-                self._store.set_cancelled(job_id, "Cancelled by user before execution.")
-                latest = self._store.get_job(job_id) or job
                 return {
                     "job_id": job_id,
                     "cancelled": True,
-                    "status": latest["status"],
+                    "status": "cancelled",
                     "message": "Job cancelled.",
                 }
+            self._cancel_reasons.pop(job_id, None)
 
-        if job["status"] == "running":
+        if status == "running":
             if cancel_event is not None:
                 cancel_event.set()
-            self._store.request_cancel(
+            if self._store.request_cancel(
                 job_id, reason="Cancellation requested by user while running."
-            )
-            latest = self._store.get_job(job_id) or job
-            return {
-                "job_id": job_id,
-                "cancelled": True,
-                "status": latest["status"],
-                "message": "Cancellation requested for running job.",
-            }
+            ):
+                return {
+                    "job_id": job_id,
+                    "cancelled": True,
+                    "status": "running",
+                    "message": "Cancellation requested for running job.",
+                }
 
-        latest = self._store.get_job(job_id) or job
         return {
             "job_id": job_id,
             "cancelled": False,
-            "status": latest["status"],
+            "status": self._store.get_job_status(job_id) or status,
             "message": "Job is not cancellable in its current state.",
         }
 
     def shutdown(self) -> None:
+        with self._hold_lock:
+            held = list(self._held)
+            self._held.clear()
+        for job_id in held:
+            self._cancel_events.pop(job_id, None)
+            self._store.set_cancelled(job_id, "Cancelled before execution.")
         self._executor.shutdown(wait=False, cancel_futures=True)
 
 
+_JOB_FN_KWARGS = ("cancel_event", "job_id")
+_ACCEPTED_KWARGS_CACHE: dict[Any, tuple[str, ...]] = {}
+
+
+def _accepted_job_kwargs(fn: Callable[..., Any]) -> tuple[str, ...]:
+    # Job callables are usually closures re-created per request, so key plain
+    # functions on their code object; decorated callables are resolved each time.
+    code = getattr(fn, "__code__", None)
+    cacheable = (
+        isinstance(fn, types.FunctionType)
+        and not hasattr(fn, "__wrapped__")
+        and not hasattr(fn, "__signature__")
+    )
+    if cacheable:
+        cached = _ACCEPTED_KWARGS_CACHE.get(code)
+        if cached is not None:
+            return cached
+    parameters = inspect.signature(fn).parameters
+    accepted = tuple(name for name in _JOB_FN_KWARGS if name in parameters)
+    if cacheable:
+        _ACCEPTED_KWARGS_CACHE[code] = accepted
+    return accepted
+
+
 def _invoke_job_fn(
     fn: Callable[..., dict[str, Any]],
     *,
     cancel_event: threading.Event,
     job_id: str,
 ) -> dict[str, Any]:
-    signature = inspect.signature(fn)
+    accepted = _accepted_job_kwargs(fn)
     kwargs: dict[str, Any] = {}
-    if "cancel_event" in signature.parameters:
+    if "cancel_event" in accepted:
         kwargs["cancel_event"] = cancel_event
-    if "job_id" in signature.parameters:
+    if "job_id" in accepted:
         kwargs["job_id"] = job_id
     return fn(**kwargs)
@@ -1,22 +1,56 @@
 from __future__ import annotations
 
 import json
+import secrets
 import sqlite3
+import sys
 import threading
-import uuid
-from collections.abc import Mapping
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Callable
 
 _WRITE_FLUSH_INTERVAL_SECONDS = 0.025
 _EVENT_BATCH_WAKE_THRESHOLD = 16
+_JOB_COLUMNS = (
+    "job_id, kind, status, created_at, updated_at, "
+    "cancel_requested, request_json, progress_json, result_json, error_text, "
+    "created_at_ms, updated_at_ms"
+)
+# Stored JSON is only read back by this module, so skip the spaces. Keep ASCII
+# escaping: lone surrogates accepted by json.loads cannot be bound as UTF-8 text.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=(",", ":"))
+_MEMORY_PATH = ":memory:"
+_SET_STATUS_ALLOW_SLOTS = 2
+_SET_STATUS_SQL = """
+UPDATE jobs
+SET status = ?,
+    updated_at = ?,
+    updated_at_ms = ?,
+    result_json = ?,
+    error_text = ?,
+    cancel_requested = COALESCE(?, cancel_requested)
+WHERE job_id = ? AND status IN (?, ?)
+"""
+_LIST_JOBS_SQL = f"""
+SELECT {_JOB_COLUMNS}
+FROM jobs
+ORDER BY updated_at DESC
+LIMIT ?
+"""
 
 
 def _utc_now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
+def _utc_now_stamp() -> tuple[str, int]:
+    now = datetime.now(UTC)
+    return now.isoformat(), int(now.timestamp() * 1000)
+
+
 def _duration_ms(start_iso: str, end_iso: str) -> int | None:
     try:
         start = datetime.fromisoformat(start_iso)
@@ -102,6 +136,11 @@ def _build_recovered_progress_payload(
 
 
 def _clean_float(value: Any) -> float | None:
+    value_type = type(value)
+    if value_type is float:
+        return round(value, 2)
+    if value_type is int:
+        return round(float(value), 2)
     if isinstance(value, bool) or value is None:
         return None
     if isinstance(value, (int, float)):
@@ -142,12 +181,13 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
             continue
 
         job_id = _clean_text(job.get("job_id")) or "unknown-job"
-        job_kind = _clean_text(job.get("kind")) or "unknown"
+        job_kind = sys.intern(_clean_text(job.get("kind")) or "unknown")
         discovered_at = (
             _clean_text(job.get("updated_at"))
             or _clean_text(job.get("created_at"))
             or ""
         )
+        timestamp = _timestamp_key(discovered_at)
         request_payload = job.get("request")
         request_objective = None
         if isinstance(request_payload, Mapping):
@@ -164,12 +204,9 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
             drug_id = _candidate_key(raw_candidate, index)
             score = _clean_float(raw_candidate.get("score")) or 0.0
             promising = bool(raw_candidate.get("promising"))
-            tool = _clean_text(raw_candidate.get("tool")) or "unknown"
-            timestamp = _timestamp_key(discovered_at)
-            metrics = _clean_mapping(raw_candidate.get("metrics"))
-            admet = _clean_mapping(raw_candidate.get("admet"))
-            evidence_paths = _clean_mapping(raw_candidate.get("evidence_paths"))
-            tool_args = _clean_mapping(raw_candidate.get("tool_args"))
+            # Tool names repeat across every job; share one string per name.
+            tool = sys.intern(_clean_text(raw_candidate.get("tool")) or "unknown")
+            candidate_rank = (1 if promising else 0, score, timestamp)
             source = {
                 "job_id": job_id,
                 "job_kind": job_kind,
@@ -192,21 +229,40 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
                     "score": score,
                     "promising": promising,
                     "assessment": _clean_text(raw_candidate.get("assessment")),
-                    "metrics": metrics,
-                    "admet": admet,
-                    "evidence_paths": evidence_paths,
-                    "tool_args": tool_args,
+                    "metrics": _clean_mapping(raw_candidate.get("metrics")),
+                    "admet": _clean_mapping(raw_candidate.get("admet")),
+                    "evidence_paths": _clean_mapping(raw_candidate.get("evidence_paths")),
+                    "tool_args": _clean_mapping(raw_candidate.get("tool_args")),
                     "first_seen_at": discovered_at,
                     "latest_seen_at": discovered_at,
                     "seen_count": 0,
                     "promising_runs": 0,
                     "source_jobs": set(),
                     "sources": [],
-                    "_best_rank": (1 if promising else 0, score, timestamp),
+                    "_best_rank": candidate_rank,
                     "_latest_timestamp": timestamp,
                     "_first_timestamp": timestamp or float("inf"),
                 }
                 aggregated[drug_id] = entry
+            elif candidate_rank >= entry["_best_rank"]:
+                entry["_best_rank"] = candidate_rank
+                entry["score"] = score
+                entry["tool"] = tool
+                entry["name"] = _canonical_drug_name(raw_candidate, drug_id)
+                entry["target"] = (
+                    _clean_text(raw_candidate.get("target")) or entry["target"]
+                )
+                entry["smiles"] = (
+                    _clean_text(raw_candidate.get("smiles")) or entry["smiles"]
+                )
+                entry["assessment"] = (
+                    _clean_text(raw_candidate.get("assessment")) or entry["assessment"]
+                )
+                # Copy nested mappings only for the observation that wins the rank.
+                for field_name in ("metrics", "admet", "evidence_paths", "tool_args"):
+                    cleaned = _clean_mapping(raw_candidate.get(field_name))
+                    if cleaned:
+                        entry[field_name] = cleaned
 
             entry["seen_count"] = int(entry["seen_count"]) + 1
             if promising:
@@ -227,33 +283,10 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
                 entry["_first_timestamp"] = timestamp
                 entry["first_seen_at"] = discovered_at or entry["first_seen_at"]
 
-            candidate_rank = (1 if promising else 0, score, timestamp)
-            if candidate_rank >= entry["_best_rank"]:
-                entry["_best_rank"] = candidate_rank
-                entry["score"] = score
-                entry["tool"] = tool
-                entry["name"] = _canonical_drug_name(raw_candidate, drug_id)
-                entry["target"] = (
-                    _clean_text(raw_candidate.get("target")) or entry["target"]
-                )
-                entry["smiles"] = (
-                    _clean_text(raw_candidate.get("smiles")) or entry["smiles"]
-                )
-                entry["assessment"] = (
-                    _clean_text(raw_candidate.get("assessment")) or entry["assessment"]
-                )
-                if metrics:
-                    entry["metrics"] = metrics
-                if admet:
-                    entry["admet"] = admet
-                if evidence_paths:
-                    entry["evidence_paths"] = evidence_paths
-                if tool_args:
-                    entry["tool_args"] = tool_args
-
     drugs: list[dict[str, Any]] = []
     targets: set[str] = set()
     tools: set[str] = set()
+    promising_count = 0
 
     for entry in aggregated.values():
         entry["tools"] = sorted(str(item) for item in entry["tools"] if item)
@@ -270,6 +303,8 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
         entry.pop("_first_timestamp", None)
         entry.pop("source_jobs", None)
         drugs.append(entry)
+        if entry["promising"]:
+            promising_count += 1
 
         target = _clean_text(entry.get("target"))
         if target is not None:
@@ -289,7 +324,6 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
         )
     )
 
-    promising_count = sum(1 for item in drugs if bool(item.get("promising")))
     return {
         "drugs": drugs,
         "summary": {
@@ -307,17 +341,24 @@ def build_promising_drug_snapshot(jobs: list[dict[str, Any]]) -> dict[str, Any]:
 
 
 class JobStore:
-    """SQLite-backed job metadata store."""
+    """SQLite-backed job metadata store.
 
-    def __init__(self, path: Path) -> None:
+    Pass ``":memory:"`` as ``path`` for a private in-memory database that lives
+    as long as the store.
+    """
+
+    def __init__(self, path: Path | str) -> None:
         self._path = path
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
+        if path != _MEMORY_PATH:
+            self._path = Path(path)
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
         self._condition = threading.Condition(self._lock)
+        self._transaction_depth = 0
         self._revision = 0
         self._conn = self._connect()
         self._async_writes_enabled = True
-        self._pending_progress: dict[str, tuple[str, str | None]] = {}
+        self._pending_progress: dict[str, tuple[str, int, str | None]] = {}
         self._pending_events: list[tuple[str, str, str, str, str, str | None]] = []
         self._writer_stop = threading.Event()
         self._writer_wakeup = threading.Event()
@@ -331,6 +372,8 @@ class JobStore:
             tuple[int, str | None, tuple[str, ...] | None],
             tuple[int, list[dict[str, Any]]],
         ] = {}
+        # Mirrors jobs.cancel_requested so cancellation polls skip SQLite.
+        self._cancel_requested_ids: set[str] = set()
         self._init_db()
         self._writer_thread = threading.Thread(
             target=self._writer_loop,
@@ -349,6 +392,8 @@ class JobStore:
             conn = self._conn
             conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS jobs (
                     job_id TEXT PRIMARY KEY,
@@ -360,7 +405,9 @@ class JobStore:
                     request_json TEXT NOT NULL,
                     progress_json TEXT,
                     result_json TEXT,
-                    error_text TEXT
+                    error_text TEXT,
+                    created_at_ms INTEGER,
+                    updated_at_ms INTEGER
                 )
                 """)
             conn.execute("""
@@ -399,7 +446,50 @@ class JobStore:
                 )
             if "progress_json" not in columns:
                 conn.execute("ALTER TABLE jobs ADD COLUMN progress_json TEXT")
+            if "created_at_ms" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN created_at_ms INTEGER")
+            if "updated_at_ms" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN updated_at_ms INTEGER")
             conn.commit()
+            self._load_cancel_requested_ids_locked()
+
+    def _load_cancel_requested_ids_locked(self) -> None:
+        self._cancel_requested_ids = {
+            str(row["job_id"])
+            for row in self._conn.execute(
+                "SELECT job_id FROM jobs "
+                "WHERE cancel_requested = 1 AND status = 'running'"
+            ).fetchall()
+        }
+
+    def _commit_locked(self) -> None:
+        # Inside transaction() the outermost block commits once on exit.
+        if self._transaction_depth == 0:
+            self._conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several store writes into a single SQLite commit.
+
+        Other threads are blocked from the store until the block exits. If the
+        block raises, every write made inside it is rolled back.
+        """
+        with self._lock:
+            if self._transaction_depth == 0:
+                # Keep buffered progress from other jobs out of a rollback.
+                self._ensure_flushed_locked()
+            self._transaction_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self._conn.rollback()
+                    self._load_cancel_requested_ids_locked()
+                    self._bump_revision_locked()
+                raise
+            self._transaction_depth -= 1
+            self._commit_locked()
 
     def _bump_revision_locked(self) -> None:
         self._revision += 1
@@ -424,14 +514,14 @@ class JobStore:
 
         wrote = False
         if pending_progress:
-            for job_id, (updated_at, progress_json) in pending_progress:
+            for job_id, (updated_at, updated_at_ms, progress_json) in pending_progress:
                 cursor = conn.execute(
                     """
                     UPDATE jobs
-                    SET updated_at = ?, progress_json = ?
+                    SET updated_at = ?, updated_at_ms = ?, progress_json = ?
                     WHERE job_id = ? AND status = 'running'
                     """,
-                    (updated_at, progress_json, job_id),
+                    (updated_at, updated_at_ms, progress_json, job_id),
                 )
                 wrote = wrote or cursor.rowcount > 0
 
@@ -446,7 +536,7 @@ class JobStore:
             )
             wrote = True
 
-        conn.commit()
+        self._commit_locked()
         if wrote:
             self._bump_revision_locked()
         return wrote
@@ -478,6 +568,29 @@ class JobStore:
             self._condition.wait(timeout=max(float(timeout), 0.0))
             return self._revision
 
+    def wait_for_job(
+        self,
+        job_id: str,
+        *,
+        statuses: tuple[str, ...] | frozenset[str],
+        timeout: float,
+    ) -> dict[str, Any] | None:
+        """Block until the job reaches one of ``statuses`` or ``timeout`` expires.
+
+        Returns the job as last seen (whatever its status), or None if it does
+        not exist.
+        """
+        deadline = time.monotonic() + max(float(timeout), 0.0)
+        change_token = self.change_token()
+        status = self.get_job_status(job_id)
+        while status is not None and status not in statuses:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            change_token = self.wait_for_change(change_token, timeout=remaining)
+            status = self.get_job_status(job_id)
+        return self.get_job(job_id)
+
     def shutdown(self) -> None:
         self._async_writes_enabled = False
         self._writer_stop.set()
@@ -487,8 +600,8 @@ class JobStore:
             self._flush_pending_writes_locked()
 
     def create_job(self, *, kind: str, request: dict[str, Any]) -> dict[str, Any]:
-        job_id = str(uuid.uuid4())
-        now = _utc_now_iso()
+        job_id = secrets.token_hex(16)
+        now, now_ms = _utc_now_stamp()
         with self._lock:
             self._ensure_flushed_locked()
             conn = self._conn
@@ -496,8 +609,9 @@ class JobStore:
                 """
                 INSERT INTO jobs(
                     job_id, kind, status, cancel_requested, created_at, updated_at,
-                    request_json, progress_json, result_json, error_text
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    request_json, progress_json, result_json, error_text,
+                    created_at_ms, updated_at_ms
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     job_id,
@@ -506,13 +620,15 @@ class JobStore:
                     0,
                     now,
                     now,
-                    json.dumps(request, ensure_ascii=True),
+                    _JSON_ENCODER.encode(request) if request else "{}",
                     None,
                     None,
                     None,
+                    now_ms,
+                    now_ms,
                 ),
             )
-            conn.commit()
+            self._commit_locked()
             self._bump_revision_locked()
         return {
             "job_id": job_id,
@@ -571,7 +687,7 @@ class JobStore:
         *,
         reason: str = "Cancellation requested by user.",
     ) -> bool:
-        now = _utc_now_iso()
+        now, now_ms = _utc_now_stamp()
         with self._lock:
             self._ensure_flushed_locked()
             conn = self._conn
@@ -580,91 +696,84 @@ class JobStore:
                 UPDATE jobs
                 SET cancel_requested = 1,
                     updated_at = ?,
+                    updated_at_ms = ?,
                     error_text = COALESCE(error_text, ?)
                 WHERE job_id = ? AND status = 'running'
                 """,
-                (now, reason, job_id),
+                (now, now_ms, reason, job_id),
             )
-            conn.commit()
+            self._commit_locked()
             if cursor.rowcount > 0:
+                self._cancel_requested_ids.add(job_id)
                 self._bump_revision_locked()
             return cursor.rowcount > 0
 
-    def is_cancel_requested(self, job_id: str) -> bool:
+    def get_job_status(self, job_id: str) -> str | None:
         with self._lock:
             self._ensure_flushed_locked()
-            conn = self._conn
-            row = conn.execute(
-                "SELECT cancel_requested FROM jobs WHERE job_id = ?",
+            row = self._conn.execute(
+                "SELECT status FROM jobs WHERE job_id = ?",
                 (job_id,),
             ).fetchone()
-        if row is None:
-            return False
-        return bool(int(row["cancel_requested"]))
+        return None if row is None else str(row["status"])
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """Return True while a running job has an outstanding cancel request."""
+        return job_id in self._cancel_requested_ids
 
     def _set_status(
         self,
         job_id: str,
         *,
         status: str,
+        allow_from: tuple[str, ...],
         result: dict[str, Any] | None = None,
         error: str | None = None,
         cancel_requested: bool | None = None,
-        allow_from: tuple[str, ...] | None = None,
     ) -> bool:
-        now = _utc_now_iso()
+        if not 1 <= len(allow_from) <= _SET_STATUS_ALLOW_SLOTS:
+            raise ValueError("allow_from must name one or two statuses")
+        now, now_ms = _utc_now_stamp()
         result_json = (
-            json.dumps(result, ensure_ascii=True) if result is not None else None
+            _JSON_ENCODER.encode(result) if result is not None else None
         )
         cancel_requested_value = (
             1 if cancel_requested else 0 if cancel_requested is not None else None
         )
+        # Pad allow_from so every transition shares one cached statement.
+        padding = _SET_STATUS_ALLOW_SLOTS - len(allow_from)
+        allowed = allow_from + allow_from[-1:] * padding
         with self._lock:
             self._ensure_flushed_locked()
             conn = self._conn
-            if cancel_requested_value is None:
-                set_clause = "status = ?, updated_at = ?, result_json = ?, error_text = ?"
-                values: tuple[Any, ...] = (status, now, result_json, error)
-            else:
-                set_clause = (
-                    "status = ?, updated_at = ?, result_json = ?, error_text = ?, cancel_requested = ?"
-                )
-                values = (
+            cursor = conn.execute(
+                _SET_STATUS_SQL,
+                (
                     status,
                     now,
+                    now_ms,
                     result_json,
                     error,
                     cancel_requested_value,
-                )
-            if allow_from:
-                placeholders = ",".join("?" for _ in allow_from)
-                cursor = conn.execute(
-                    f"""
-                    UPDATE jobs
-                    SET {set_clause}
-                    WHERE job_id = ? AND status IN ({placeholders})
-                    """,
-                    (*values, job_id, *allow_from),
-                )
-            else:
-                cursor = conn.execute(
-                    f"""
-                    UPDATE jobs
-                    SET {set_clause}
-                    WHERE job_id = ?
-                    """,
-                    (*values, job_id),
-                )
-            conn.commit()
+                    job_id,
+                    *allowed,
+                ),
+            )
+            self._commit_locked()
             if cursor.rowcount > 0:
+                # Only running jobs are tracked, so the set stays bounded.
+                if status == "running" and cancel_requested_value == 1:
+                    self._cancel_requested_ids.add(job_id)
+                else:
+                    self._cancel_requested_ids.discard(job_id)
                 self._bump_revision_locked()
             return cursor.rowcount > 0
 
     def update_progress(self, job_id: str, progress: dict[str, Any] | None) -> bool:
         progress_json = (
-            json.dumps(progress, ensure_ascii=True) if progress is not None else None
+            _JSON_ENCODER.encode(progress) if progress is not None else None
         )
-        now = _utc_now_iso()
+        now, now_ms = _utc_now_stamp()
         with self._lock:
             conn = self._conn
             row = conn.execute(
@@ -677,17 +786,17 @@ class JobStore:
                 cursor = conn.execute(
                     """
                     UPDATE jobs
-                    SET updated_at = ?, progress_json = ?
+                    SET updated_at = ?, updated_at_ms = ?, progress_json = ?
                     WHERE job_id = ? AND status = 'running'
                     """,
-                    (now, progress_json, job_id),
+                    (now, now_ms, progress_json, job_id),
                 )
-                conn.commit()
+                self._commit_locked()
                 if cursor.rowcount > 0:
                     self._bump_revision_locked()
                 return cursor.rowcount > 0
 
-            self._pending_progress[str(job_id)] = (now, progress_json)
+            self._pending_progress[str(job_id)] = (now, now_ms, progress_json)
             return True
 
     def get_job(self, job_id: str) -> dict[str, Any] | None:
@@ -695,9 +804,8 @@ class JobStore:
             self._ensure_flushed_locked()
             conn = self._conn
             row = conn.execute(
-                """
-                SELECT job_id, kind, status, created_at, updated_at,
-                       cancel_requested, request_json, progress_json, result_json, error_text
+                f"""
+                SELECT {_JOB_COLUMNS}
                 FROM jobs
                 WHERE job_id = ?
                 """,
@@ -721,7 +829,7 @@ class JobStore:
         normalized_summary = _clean_text(summary) or normalized_type
         normalized_level = _clean_text(level) or "info"
         detail_json = (
-            json.dumps(detail, ensure_ascii=True) if isinstance(detail, Mapping) else None
+            _JSON_ENCODER.encode(detail) if isinstance(detail, Mapping) else None
         )
         now = _utc_now_iso()
         with self._lock:
@@ -742,7 +850,7 @@ class JobStore:
                     detail_json,
                 ),
             )
-            conn.commit()
+            self._commit_locked()
             event_id = int(cursor.lastrowid)
             self._bump_revision_locked()
         return {
@@ -767,7 +875,7 @@ class JobStore:
             normalized_level = _clean_text(event.get("level")) or "info"
             normalized_detail = _clean_mapping(detail)
             detail_json = (
-                json.dumps(normalized_detail, ensure_ascii=True)
+                _JSON_ENCODER.encode(normalized_detail)
                 if normalized_detail
                 else None
             )
@@ -790,7 +898,7 @@ class JobStore:
                             detail_json,
                         ),
                     )
-                    conn.commit()
+                    self._commit_locked()
                     self._bump_revision_locked()
                     return
 
@@ -893,8 +1001,7 @@ class JobStore:
                 placeholders = ",".join("?" for _ in normalized_statuses)
                 rows = conn.execute(
                     f"""
-                    SELECT job_id, kind, status, created_at, updated_at,
-                           cancel_requested, request_json, progress_json, result_json, error_text
+                    SELECT {_JOB_COLUMNS}
                     FROM jobs
                     WHERE status IN ({placeholders})
                     ORDER BY updated_at DESC
@@ -903,16 +1010,7 @@ class JobStore:
                     (*normalized_statuses, safe_limit),
                 ).fetchall()
             else:
-                rows = conn.execute(
-                    """
-                    SELECT job_id, kind, status, created_at, updated_at,
-                           cancel_requested, request_json, progress_json, result_json, error_text
-                    FROM jobs
-                    ORDER BY updated_at DESC
-                    LIMIT ?
-                    """,
-                    (safe_limit,),
-                ).fetchall()
+                rows = conn.execute(_LIST_JOBS_SQL, (safe_limit,)).fetchall()
             payload = [self._row_to_job(row) for row in rows]
             self._list_jobs_cache[cache_key] = (self._revision, payload)
             return payload
@@ -929,6 +1027,7 @@ class JobStore:
                 tuple(statuses),
             ).fetchall()
             job_ids = [str(row["job_id"]) for row in job_rows]
+            self._cancel_requested_ids.difference_update(job_ids)
             if job_ids:
                 event_placeholders = ",".join("?" for _ in job_ids)
                 conn.execute(
@@ -939,11 +1038,57 @@ class JobStore:
                 f"DELETE FROM jobs WHERE status IN ({placeholders})",
                 tuple(statuses),
             )
-            conn.commit()
+            self._commit_locked()
             if job_ids or cursor.rowcount > 0:
                 self._bump_revision_locked()
             return int(cursor.rowcount)
 
+    def prune_jobs(
+        self,
+        *,
+        statuses: tuple[str, ...],
+        updated_before: str,
+        batch_size: int = 500,
+    ) -> int:
+        if not statuses:
+            raise ValueError("statuses must not be empty")
+        safe_batch = max(int(batch_size), 1)
+        placeholders = ",".join("?" for _ in statuses)
+        deleted = 0
+        while True:
+            # Commit per batch and release the lock in between so readers and
+            # the progress writer are not stalled behind one large DELETE.
+            with self._lock:
+                self._ensure_flushed_locked()
+                conn = self._conn
+                rows = conn.execute(
+                    f"""
+                    SELECT rowid, job_id FROM jobs
+                    WHERE status IN ({placeholders}) AND updated_at < ?
+                    LIMIT ?
+                    """,
+                    (*statuses, updated_before, safe_batch),
+                ).fetchall()
+                if not rows:
+                    return deleted
+                row_placeholders = ",".join("?" for _ in rows)
+                conn.execute(
+                    f"DELETE FROM job_events WHERE job_id IN ({row_placeholders})",
+                    tuple(row["job_id"] for row in rows),
+                )
+                cursor = conn.execute(
+                    f"DELETE FROM jobs WHERE rowid IN ({row_placeholders})",
+                    tuple(row["rowid"] for row in rows),
+                )
+                self._commit_locked()
+                self._cancel_requested_ids.difference_update(
+                    str(row["job_id"]) for row in rows
+                )
+                self._bump_revision_locked()
+                deleted += int(cursor.rowcount)
+            if len(rows) < safe_batch:
+                return deleted
+
     def recover_interrupted_jobs(
         self,
         *,
@@ -951,7 +1096,7 @@ class JobStore:
             "Studio restarted; previous in-memory job execution was interrupted."
         ),
     ) -> int:
-        now = _utc_now_iso()
+        now, now_ms = _utc_now_stamp()
         recovered = 0
         with self._lock:
             self._ensure_flushed_locked()
@@ -976,6 +1121,7 @@ class JobStore:
                     SET status = 'cancelled',
                         cancel_requested = 1,
                         updated_at = ?,
+                        updated_at_ms = ?,
                         progress_json = ?,
                         result_json = NULL,
                         error_text = ?
@@ -983,13 +1129,15 @@ class JobStore:
                     """,
                     (
                         now,
-                        json.dumps(progress_payload, ensure_ascii=True),
+                        now_ms,
+                        _JSON_ENCODER.encode(progress_payload),
                         _merge_recovery_error(row["error_text"], reason),
                         row["job_id"],
                     ),
                 )
+                self._cancel_requested_ids.discard(str(row["job_id"]))
                 recovered += 1
-            conn.commit()
+            self._commit_locked()
             if recovered:
                 self._bump_revision_locked()
         return recovered
@@ -1038,28 +1186,46 @@ class JobStore:
 
     @staticmethod
     def _row_to_job(row: sqlite3.Row) -> dict[str, Any]:
-        request_json = row["request_json"]
-        progress_json = row["progress_json"]
-        result_json = row["result_json"]
-        created_at = row["created_at"]
-        updated_at = row["updated_at"]
-        request = json.loads(request_json) if isinstance(request_json, str) else {}
+        # Positional unpack; callers must select columns in _JOB_COLUMNS order.
+        (
+            job_id,
+            kind,
+            status,
+            created_at,
+            updated_at,
+            cancel_requested,
+            request_json,
+            progress_json,
+            result_json,
+            error_text,
+            created_at_ms,
+            updated_at_ms,
+        ) = row
+        request = (
+            json.loads(request_json)
+            if isinstance(request_json, str) and request_json != "{}"
+            else {}
+        )
         progress = (
             json.loads(progress_json) if isinstance(progress_json, str) else None
         )
         result = json.loads(result_json) if isinstance(result_json, str) else None
         return {
-            "job_id": row["job_id"],
-            "kind": row["kind"],
-            "status": row["status"],
-            "cancel_requested": bool(int(row["cancel_requested"])),
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "cancel_requested": bool(cancel_requested),
             "created_at": created_at,
             "updated_at": updated_at,
-            "duration_ms": _duration_ms(created_at, updated_at),
+            "duration_ms": (
+                max(updated_at_ms - created_at_ms, 0)
+                if created_at_ms is not None and updated_at_ms is not None
+                else _duration_ms(created_at, updated_at)
+            ),
             "request": request,
             "progress": progress,
             "result": result,
-            "error": row["error_text"],
+            "error": error_text,
         }
 
     @staticmethod
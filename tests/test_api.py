@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import json
+import queue
+import shutil
 import sys
 import tempfile
 import threading
 import time
 import unittest
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from http.client import HTTPConnection
 from pathlib import Path
 from urllib.parse import quote
 from unittest import mock
@@ -19,30 +26,104 @@ if str(SRC) not in sys.path:
 
 from clawcures_ui.app import create_server
 from clawcures_ui.config import StudioConfig
+from clawcures_ui.storage import JobStore
+
+
+_ALL_JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+# Shared fixtures; the helpers and JobStore only serialize them, so they are
+# never mutated.
+_VALIDATE_SPEC_PLAN = {"calls": [{"tool": "refua_validate_spec", "args": {}}]}
+_LUMOTRIL_AFFINITY_RESULT = {
+    "objective": "Prioritize KRAS G12D therapeutics",
+    "promising_cures": [
+        {
+            "cure_id": "drug:lumotril",
+            "name": "Lumotril",
+            "target": "KRAS G12D",
+            "smiles": "CCOC1=CC=CC=C1",
+            "tool": "refua_affinity",
+            "score": 81.6,
+            "promising": True,
+            "assessment": "Strong binding and tractable chemistry.",
+            "metrics": {"binding_probability": 0.84, "admet_score": 0.72},
+            "admet": {
+                "status": "favorable",
+                "key_metrics": {"admet_score": 0.72},
+            },
+        }
+    ],
+}
+_LUMOTRIL_ADMET_RESULT = {
+    "objective": "Cross-check Lumotril ADMET",
+    "promising_cures": [
+        {
+            "cure_id": "drug:lumotril",
+            "name": "Lumotril",
+            "target": "KRAS G12D",
+            "tool": "refua_admet_profile",
+            "score": 83.9,
+            "promising": True,
+            "assessment": "ADMET profile remains favorable after cross-check.",
+            "metrics": {"binding_probability": 0.84, "admet_score": 0.78},
+            "admet": {
+                "status": "favorable",
+                "key_metrics": {"admet_score": 0.78, "safety_score": 0.82},
+            },
+        }
+    ],
+}
 
 
-class StudioApiTest(unittest.TestCase):
-    def setUp(self) -> None:
-        self._tmp = tempfile.TemporaryDirectory()
+class _StudioServerTestCase(unittest.TestCase):
+    """Runs one Studio server per test class and talks to it over keep-alive HTTP."""
+
+    config_overrides: dict = {}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp = tempfile.TemporaryDirectory()
         config = StudioConfig(
             host="127.0.0.1",
             port=0,
-            data_dir=Path(self._tmp.name) / "data",
-            workspace_root=Path(__file__).resolve().parents[2],
+            data_dir=Path(cls._tmp.name) / "data",
+            workspace_root=ROOT.parent,
             max_workers=1,
             autostart_agent=False,
-        )
-        self.server, self.app = create_server(config)
-        self.host, self.port = self.server.server_address
-        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
-        self._thread.start()
-
-    def tearDown(self) -> None:
-        self.server.shutdown()
-        self.server.server_close()
-        self.app.shutdown()
-        self._thread.join(timeout=2)
-        self._tmp.cleanup()
+            **cls.config_overrides,
+        )
+        cls.server, cls.app = create_server(config)
+        cls.app.prewarm()
+        cls.host, cls.port = cls.server.server_address
+        cls._thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls._thread.start()
+        # The handler speaks HTTP/1.1, so keep-alive connections are pooled
+        # and reused across tests and parallel batches.
+        cls._conn_pool: queue.SimpleQueue[HTTPConnection] = queue.SimpleQueue()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        while not cls._conn_pool.empty():
+            cls._conn_pool.get_nowait().close()
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.app.shutdown()
+        cls._thread.join(timeout=2)
+        cls._tmp.cleanup()
+
+    @classmethod
+    @contextmanager
+    def _connection(cls) -> Iterator[HTTPConnection]:
+        try:
+            conn = cls._conn_pool.get_nowait()
+        except queue.Empty:
+            conn = HTTPConnection(cls.host, cls.port, timeout=5)
+        try:
+            yield conn
+        except BaseException:
+            # The response may be half-read; never hand this socket out again.
+            conn.close()
+            raise
+        cls._conn_pool.put(conn)
 
     def _request(
         self,
@@ -53,7 +134,44 @@ class StudioApiTest(unittest.TestCase):
         allow_error: bool = False,
         token: str | None = None,
     ) -> dict:
-        url = f"http://{self.host}:{self.port}{path}"
+        with self._connection() as conn:
+            return self._request_on(
+                conn,
+                method,
+                path,
+                payload,
+                allow_error=allow_error,
+                token=token,
+            )
+
+    def _request_parallel(
+        self,
+        calls: list[tuple[str, str, dict | None]],
+        *,
+        allow_error: bool = False,
+    ) -> list[dict]:
+        # Independent calls overlap on pooled connections; results keep the
+        # order of ``calls``.
+        def _call(method: str, path: str, payload: dict | None) -> dict:
+            with self._connection() as conn:
+                return self._request_on(
+                    conn, method, path, payload, allow_error=allow_error
+                )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(_call, *call) for call in calls]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _request_on(
+        conn: HTTPConnection,
+        method: str,
+        path: str,
+        payload: dict | None = None,
+        *,
+        allow_error: bool = False,
+        token: str | None = None,
+    ) -> dict:
         data = None
         headers = {}
         if payload is not None:
@@ -62,28 +180,48 @@ class StudioApiTest(unittest.TestCase):
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
-        request = Request(url, method=method, data=data, headers=headers)
-        try:
-            with urlopen(request, timeout=5) as response:
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as exc:
-            body = exc.read().decode("utf-8")
-            parsed = json.loads(body) if body else {}
-            exc.close()
+        conn.request(method, path, body=data, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        if response.status >= 400:
             if allow_error:
-                return {"status_code": exc.code, "body": parsed}
-            raise AssertionError(f"HTTP {exc.code} for {path}: {body}") from exc
+                parsed = json.loads(body) if body else {}
+                return {"status_code": response.status, "body": parsed}
+            message = body.decode("utf-8", errors="replace")
+            raise AssertionError(f"HTTP {response.status} for {path}: {message}")
+        return json.loads(body)
 
     def _request_text(self, path: str) -> tuple[int, str, str]:
-        url = f"http://{self.host}:{self.port}{path}"
-        request = Request(url, method="GET")
-        with urlopen(request, timeout=5) as response:
+        with self._connection() as conn:
+            conn.request("GET", path)
+            response = conn.getresponse()
             return (
                 response.status,
                 response.headers.get_content_type(),
                 response.read().decode("utf-8"),
             )
 
+
+class StudioApiTest(_StudioServerTestCase):
+    # One server serves the whole class; setUp empties the job store so each
+    # test still starts from a clean slate.
+    def setUp(self) -> None:
+        self.app.store.clear_jobs(statuses=_ALL_JOB_STATUSES)
+
+    def _dispatch(
+        self,
+        method: str,
+        path: str,
+        payload: dict | None = None,
+    ) -> dict:
+        # In-process routing for tests that only check store-backed payloads;
+        # HTTP framing is covered by the _request-based tests.
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        status, response = self.app.dispatch(method, path, body)
+        if status >= 400:
+            raise AssertionError(f"HTTP {status} for {path}: {response}")
+        return response
+
     def test_health_examples_and_ecosystem_endpoints(self) -> None:
         health = self._request("GET", "/api/health")
         self.assertTrue(health["ok"])
@@ -108,31 +246,36 @@ class StudioApiTest(unittest.TestCase):
             "/api/clinical/trials",
             "/api/preclinical/templates",
         ]
-        for path in removed_gets:
-            payload = self._request("GET", path, allow_error=True)
-            self.assertEqual(payload["status_code"], 404, path)
-
         removed_posts = [
             "/api/clawcures/handoff",
             "/api/portfolio/rank",
             "/api/programs/upsert",
             "/api/regulatory/bundle/build",
         ]
-        for path in removed_posts:
-            payload = self._request("POST", path, {}, allow_error=True)
-            self.assertEqual(payload["status_code"], 404, path)
+        calls = [("GET", path, None) for path in removed_gets]
+        calls += [("POST", path, {}) for path in removed_posts]
 
-    def test_static_ui_routes(self) -> None:
-        status, content_type, body = self._request_text("/")
-        self.assertEqual(status, 200)
-        self.assertEqual(content_type, "text/html")
-        self.assertIn("ClawCures UI", body)
+        payloads = self._request_parallel(calls, allow_error=True)
+        for (method, path, _), payload in zip(calls, payloads):
+            with self.subTest(method=method, path=path):
+                self.assertEqual(payload["status_code"], 404)
 
-        status, content_type, body = self._request_text("/assets/app.js")
-        self.assertEqual(status, 200)
-        self.assertEqual(content_type, "application/javascript")
-        self.assertIn("refreshJobs", body)
-        self.assertIn("refreshPromisingDrugs", body)
+    def test_static_ui_routes(self) -> None:
+        cases = [
+            ("/", "text/html", ("ClawCures UI",)),
+            (
+                "/assets/app.js",
+                "application/javascript",
+                ("refreshJobs", "refreshPromisingDrugs"),
+            ),
+        ]
+        for path, expected_type, markers in cases:
+            with self.subTest(path=path):
+                status, content_type, body = self._request_text(path)
+                self.assertEqual(status, 200)
+                self.assertEqual(content_type, expected_type)
+                for marker in markers:
+                    self.assertIn(marker, body)
 
     def test_promising_drugs_endpoint(self) -> None:
         first = self.app.store.create_job(
@@ -140,57 +283,14 @@ class StudioApiTest(unittest.TestCase):
             request={"objective": "Prioritize KRAS G12D therapeutics"},
         )
         self.app.store.set_running(first["job_id"])
-        self.app.store.set_completed(
-            first["job_id"],
-            {
-                "objective": "Prioritize KRAS G12D therapeutics",
-                "promising_cures": [
-                    {
-                        "cure_id": "drug:lumotril",
-                        "name": "Lumotril",
-                        "target": "KRAS G12D",
-                        "smiles": "CCOC1=CC=CC=C1",
-                        "tool": "refua_affinity",
-                        "score": 81.6,
-                        "promising": True,
-                        "assessment": "Strong binding and tractable chemistry.",
-                        "metrics": {"binding_probability": 0.84, "admet_score": 0.72},
-                        "admet": {
-                            "status": "favorable",
-                            "key_metrics": {"admet_score": 0.72},
-                        },
-                    }
-                ],
-            },
-        )
+        self.app.store.set_completed(first["job_id"], _LUMOTRIL_AFFINITY_RESULT)
 
         second = self.app.store.create_job(
             kind="plan_execute",
             request={"objective": "Cross-check Lumotril ADMET"},
         )
         self.app.store.set_running(second["job_id"])
-        self.app.store.set_completed(
-            second["job_id"],
-            {
-                "objective": "Cross-check Lumotril ADMET",
-                "promising_cures": [
-                    {
-                        "cure_id": "drug:lumotril",
-                        "name": "Lumotril",
-                        "target": "KRAS G12D",
-                        "tool": "refua_admet_profile",
-                        "score": 83.9,
-                        "promising": True,
-                        "assessment": "ADMET profile remains favorable after cross-check.",
-                        "metrics": {"binding_probability": 0.84, "admet_score": 0.78},
-                        "admet": {
-                            "status": "favorable",
-                            "key_metrics": {"admet_score": 0.78, "safety_score": 0.82},
-                        },
-                    }
-                ],
-            },
-        )
+        self.app.store.set_completed(second["job_id"], _LUMOTRIL_ADMET_RESULT)
 
         payload = self._request("GET", "/api/promising-drugs?limit=20")
         self.assertIn("drugs", payload)
@@ -232,7 +332,7 @@ class StudioApiTest(unittest.TestCase):
             "POST",
             "/api/plan/validate",
             {
-                "plan": {"calls": [{"tool": "refua_validate_spec", "args": {}}]},
+                "plan": _VALIDATE_SPEC_PLAN,
                 "max_calls": 5,
             },
         )
@@ -246,22 +346,16 @@ class StudioApiTest(unittest.TestCase):
                 "objective": "Offline dry-run validation",
                 "dry_run": True,
                 "async_mode": True,
-                "plan": {"calls": [{"tool": "refua_validate_spec", "args": {}}]},
+                "plan": _VALIDATE_SPEC_PLAN,
             },
         )
         self.assertIn("job", run_payload)
         job_id = run_payload["job"]["job_id"]
 
-        deadline = time.time() + 5
-        last_status = "queued"
-        while time.time() < deadline:
-            job = self._request("GET", f"/api/jobs/{job_id}")
-            last_status = job["status"]
-            if last_status in {"completed", "failed"}:
-                break
-            time.sleep(0.1)
-
-        self.assertIn(last_status, {"completed", "failed"})
+        job = self._request(
+            "GET", f"/api/jobs/{job_id}?wait_for=completed,failed&timeout=5"
+        )
+        self.assertIn(job["status"], {"completed", "failed"})
 
     def test_execute_plan_job(self) -> None:
         run_payload = self._request(
@@ -269,22 +363,19 @@ class StudioApiTest(unittest.TestCase):
             "/api/plan/execute",
             {
                 "async_mode": True,
-                "plan": {"calls": [{"tool": "refua_validate_spec", "args": {}}]},
+                "plan": _VALIDATE_SPEC_PLAN,
             },
         )
         self.assertIn("job", run_payload)
         job_id = run_payload["job"]["job_id"]
 
-        deadline = time.time() + 5
-        last_status = "queued"
-        while time.time() < deadline:
-            job = self._request("GET", f"/api/jobs/{job_id}")
-            last_status = job["status"]
-            if last_status in {"completed", "failed"}:
-                break
-            time.sleep(0.1)
+        waited = self.app.store.wait_for_job(
+            job_id, statuses=("completed", "failed"), timeout=5.0
+        )
+        self.assertIn(waited["status"], {"completed", "failed"})
 
-        self.assertIn(last_status, {"completed", "failed"})
+        job = self._request("GET", f"/api/jobs/{job_id}")
+        self.assertEqual(job["status"], waited["status"])
 
     def test_cancel_queued_job(self) -> None:
         started = threading.Event()
@@ -296,32 +387,86 @@ class StudioApiTest(unittest.TestCase):
             return {"ok": True}
 
         first_job = self.app.runner.submit(kind="blocking", request={}, fn=_blocking)
-        self.assertTrue(started.wait(timeout=2))
+        try:
+            self.assertTrue(started.wait(timeout=2))
+            second_job = self.app.runner.submit(
+                kind="queued",
+                request={},
+                fn=lambda: {"ok": True},
+            )
+            self.assertTrue(self.app.runner.is_queued(second_job["job_id"]))
 
-        second_job = self.app.runner.submit(
-            kind="queued",
-            request={},
-            fn=lambda: {"ok": True},
+            cancel_payload = self._request(
+                "POST",
+                f"/api/jobs/{second_job['job_id']}/cancel",
+                {},
+            )
+            self.assertTrue(cancel_payload["cancelled"])
+            self.assertEqual(cancel_payload["status"], "cancelled")
+        finally:
+            release.set()
+
+        # The executor future was cancelled, so the done callback records the state.
+        second_status = self._request(
+            "GET",
+            f"/api/jobs/{second_job['job_id']}?wait_for=cancelled&timeout=5",
         )
+        self.assertEqual(second_status["status"], "cancelled")
+        self.assertEqual(second_status["error"], "Cancelled by user before execution.")
 
-        cancel_payload = self._request(
-            "POST",
-            f"/api/jobs/{second_job['job_id']}/cancel",
-            {},
+        current = self._request(
+            "GET",
+            f"/api/jobs/{first_job['job_id']}?wait_for=completed,failed&timeout=5",
         )
-        self.assertTrue(cancel_payload["cancelled"])
-        self.assertEqual(cancel_payload["status"], "cancelled")
+        self.assertEqual(current["status"], "completed")
+
+    def test_cancel_held_job(self) -> None:
+        self.app.runner.pause()
+        try:
+            first_job = self.app.runner.submit(
+                kind="held", request={}, fn=lambda: {"ok": True}
+            )
+            second_job = self.app.runner.submit(
+                kind="queued",
+                request={},
+                fn=lambda: {"ok": True},
+            )
+            self.assertTrue(self.app.runner.is_queued(second_job["job_id"]))
+
+            cancel_payload = self._request(
+                "POST",
+                f"/api/jobs/{second_job['job_id']}/cancel",
+                {},
+            )
+            self.assertTrue(cancel_payload["cancelled"])
+            self.assertEqual(cancel_payload["status"], "cancelled")
+            self.assertFalse(self.app.runner.is_queued(second_job["job_id"]))
+        finally:
+            self.app.runner.resume()
 
         second_status = self._request("GET", f"/api/jobs/{second_job['job_id']}")
         self.assertEqual(second_status["status"], "cancelled")
 
-        release.set()
-        deadline = time.time() + 5
-        while time.time() < deadline:
-            current = self._request("GET", f"/api/jobs/{first_job['job_id']}")
-            if current["status"] in {"completed", "failed"}:
-                break
-            time.sleep(0.05)
+        current = self._request(
+            "GET",
+            f"/api/jobs/{first_job['job_id']}?wait_for=completed,failed&timeout=5",
+        )
+        self.assertEqual(current["status"], "completed")
+
+    def test_job_wait_returns_current_status_on_timeout(self) -> None:
+        job = self.app.store.create_job(kind="queued", request={})
+
+        started = time.monotonic()
+        payload = self._request(
+            "GET", f"/api/jobs/{job['job_id']}?wait_for=completed&timeout=0.2"
+        )
+        self.assertEqual(payload["status"], "queued")
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+        invalid = self._request(
+            "GET", f"/api/jobs/{job['job_id']}?wait_for=done", allow_error=True
+        )
+        self.assertEqual(invalid["status_code"], 400)
 
     def test_clear_jobs_endpoint(self) -> None:
         completed = self.app.store.create_job(kind="completed-job", request={})
@@ -331,14 +476,14 @@ class StudioApiTest(unittest.TestCase):
         self.app.store.set_running(failed["job_id"])
         self.app.store.set_failed(failed["job_id"], "boom")
 
-        clear_payload = self._request(
+        clear_payload = self._dispatch(
             "POST",
             "/api/jobs/clear",
             {"statuses": ["completed", "failed"]},
         )
         self.assertGreaterEqual(clear_payload["deleted"], 2)
 
-        jobs_payload = self._request("GET", "/api/jobs?status=completed,failed")
+        jobs_payload = self._dispatch("GET", "/api/jobs?status=completed,failed")
         self.assertEqual(jobs_payload["jobs"], [])
 
     def test_jobs_endpoint_includes_live_progress_payload(self) -> None:
@@ -356,7 +501,7 @@ class StudioApiTest(unittest.TestCase):
             },
         )
 
-        payload = self._request("GET", "/api/jobs?status=running")
+        payload = self._dispatch("GET", "/api/jobs?status=running")
         matching = next(
             item for item in payload["jobs"] if item["job_id"] == job["job_id"]
         )
@@ -364,7 +509,7 @@ class StudioApiTest(unittest.TestCase):
         self.assertEqual(matching["progress"]["cycle_index"], 7)
         self.assertEqual(matching["progress"]["heartbeat_count"], 3)
 
-        detail = self._request("GET", f"/api/jobs/{job['job_id']}")
+        detail = self._dispatch("GET", f"/api/jobs/{job['job_id']}")
         self.assertEqual(
             detail["progress"]["summary"],
             "Cycle 7: planning the next discovery run.",
@@ -389,7 +534,7 @@ class StudioApiTest(unittest.TestCase):
             }
         )
 
-        detail = self._request("GET", f"/api/jobs/{job['job_id']}")
+        detail = self._dispatch("GET", f"/api/jobs/{job['job_id']}")
         self.assertEqual(len(detail["events"]), 2)
         self.assertEqual(detail["events"][0]["summary"], "Call 1 completed")
         self.assertEqual(detail["events"][1]["summary"], "Call 1 started")
@@ -414,7 +559,7 @@ class StudioApiTest(unittest.TestCase):
             },
         )
 
-        payload = self._request("GET", "/api/jobs?status=running")
+        payload = self._dispatch("GET", "/api/jobs?status=running")
         matching = next(
             item for item in payload["jobs"] if item["job_id"] == job["job_id"]
         )
@@ -444,7 +589,7 @@ class StudioApiTest(unittest.TestCase):
             },
         )
 
-        payload = self._request("GET", "/api/promising-drugs?limit=20")
+        payload = self._dispatch("GET", "/api/promising-drugs?limit=20")
         names = [item["name"] for item in payload["drugs"]]
         self.assertIn("FlushDrug", names)
 
@@ -460,13 +605,26 @@ class StudioApiTest(unittest.TestCase):
 
 
 class StudioAutostartAgentTest(unittest.TestCase):
+    # One scratch root per class (on tmpfs when available); each test gets its
+    # own subdirectory and the tree is removed once in tearDownClass.
+    @classmethod
+    def setUpClass(cls) -> None:
+        shm = Path("/dev/shm")
+        cls._tmp_root = Path(tempfile.mkdtemp(dir=shm if shm.is_dir() else None))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls._tmp_root, ignore_errors=True)
+
+    def setUp(self) -> None:
+        self._data_dir = Path(tempfile.mkdtemp(dir=self._tmp_root)) / "data"
+
     def test_create_server_recovers_orphaned_running_jobs_on_boot(self) -> None:
-        tmp = tempfile.TemporaryDirectory()
         config = StudioConfig(
             host="127.0.0.1",
             port=0,
-            data_dir=Path(tmp.name) / "data",
-            workspace_root=Path(__file__).resolve().parents[2],
+            data_dir=self._data_dir,
+            workspace_root=ROOT.parent,
             max_workers=1,
             autostart_agent=False,
         )
@@ -502,19 +660,82 @@ class StudioAutostartAgentTest(unittest.TestCase):
         finally:
             second_server.server_close()
             second_app.shutdown()
-            tmp.cleanup()
+
+    def test_create_server_prunes_expired_jobs_on_boot(self) -> None:
+        config = StudioConfig(
+            host="127.0.0.1",
+            port=0,
+            data_dir=self._data_dir,
+            workspace_root=ROOT.parent,
+            max_workers=1,
+            autostart_agent=False,
+            job_retention_days=7,
+        )
+
+        class _LongAgo(datetime):
+            @classmethod
+            def now(cls, tz=None):  # type: ignore[override]
+                return datetime(2000, 1, 1, tzinfo=tz)
+
+        first_server, first_app = create_server(config)
+        store = first_app.store
+        jobs = {}
+        for name, final_status in (
+            ("old_failed", "failed"),
+            ("old_completed", "completed"),
+            ("recent_failed", "failed"),
+        ):
+            # Old jobs get every timestamp from the storage module's clock.
+            with mock.patch(
+                "clawcures_ui.storage.datetime",
+                _LongAgo if name.startswith("old_") else datetime,
+            ):
+                job_id = store.create_job(kind=name, request={})["job_id"]
+                store.set_running(job_id)
+                if final_status == "failed":
+                    store.set_failed(job_id, "boom")
+                else:
+                    store.set_completed(job_id, {"ok": True})
+            jobs[name] = job_id
+        first_server.server_close()
+        first_app.shutdown()
+
+        second_server, second_app = create_server(config)
+        try:
+            self.assertIsNone(second_app.store.get_job(jobs["old_failed"]))
+            self.assertIsNotNone(second_app.store.get_job(jobs["old_completed"]))
+            self.assertIsNotNone(second_app.store.get_job(jobs["recent_failed"]))
+        finally:
+            second_server.server_close()
+            second_app.shutdown()
+
+    def test_create_server_keeps_jobs_without_retention(self) -> None:
+        config = StudioConfig(
+            host="127.0.0.1",
+            port=0,
+            data_dir=self._data_dir,
+            workspace_root=ROOT.parent,
+            max_workers=1,
+            autostart_agent=False,
+        )
+        self.assertEqual(config.job_retention_days, 0.0)
+
+        with mock.patch.object(JobStore, "prune_jobs") as prune_jobs:
+            server, app = create_server(config)
+            server.server_close()
+            app.shutdown()
+        prune_jobs.assert_not_called()
 
     @mock.patch("clawcures_ui.app.ContinuousDiscoveryService")
     def test_create_server_starts_continuous_agent_by_default(
         self,
         service_cls: mock.Mock,
     ) -> None:
-        tmp = tempfile.TemporaryDirectory()
         config = StudioConfig(
             host="127.0.0.1",
             port=0,
-            data_dir=Path(tmp.name) / "data",
-            workspace_root=Path(__file__).resolve().parents[2],
+            data_dir=self._data_dir,
+            workspace_root=ROOT.parent,
             max_workers=1,
             autostart_agent=True,
         )
@@ -525,19 +746,17 @@ class StudioAutostartAgentTest(unittest.TestCase):
         finally:
             server.server_close()
             app.shutdown()
-            tmp.cleanup()
 
     @mock.patch("clawcures_ui.app.ContinuousDiscoveryService")
     def test_create_server_skips_continuous_agent_when_disabled(
         self,
         service_cls: mock.Mock,
     ) -> None:
-        tmp = tempfile.TemporaryDirectory()
         config = StudioConfig(
             host="127.0.0.1",
             port=0,
-            data_dir=Path(tmp.name) / "data",
-            workspace_root=Path(__file__).resolve().parents[2],
+            data_dir=self._data_dir,
+            workspace_root=ROOT.parent,
             max_workers=1,
             autostart_agent=False,
         )
@@ -547,64 +766,14 @@ class StudioAutostartAgentTest(unittest.TestCase):
         finally:
             server.server_close()
             app.shutdown()
-            tmp.cleanup()
 
 
-class StudioApiAuthTest(unittest.TestCase):
-    def setUp(self) -> None:
-        self._tmp = tempfile.TemporaryDirectory()
-        config = StudioConfig(
-            host="127.0.0.1",
-            port=0,
-            data_dir=Path(self._tmp.name) / "data",
-            workspace_root=Path(__file__).resolve().parents[2],
-            max_workers=1,
-            autostart_agent=False,
-            auth_tokens=("viewer-token",),
-            operator_tokens=("operator-token",),
-            admin_tokens=("admin-token",),
-        )
-        self.server, self.app = create_server(config)
-        self.host, self.port = self.server.server_address
-        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
-        self._thread.start()
-
-    def tearDown(self) -> None:
-        self.server.shutdown()
-        self.server.server_close()
-        self.app.shutdown()
-        self._thread.join(timeout=2)
-        self._tmp.cleanup()
-
-    def _request(
-        self,
-        method: str,
-        path: str,
-        payload: dict | None = None,
-        *,
-        token: str | None = None,
-        allow_error: bool = False,
-    ) -> dict:
-        url = f"http://{self.host}:{self.port}{path}"
-        data = None
-        headers = {}
-        if payload is not None:
-            data = json.dumps(payload).encode("utf-8")
-            headers["Content-Type"] = "application/json"
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-
-        request = Request(url, method=method, data=data, headers=headers)
-        try:
-            with urlopen(request, timeout=5) as response:
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as exc:
-            body = exc.read().decode("utf-8")
-            parsed = json.loads(body) if body else {}
-            exc.close()
-            if allow_error:
-                return {"status_code": exc.code, "body": parsed}
-            raise AssertionError(f"HTTP {exc.code} for {path}: {body}") from exc
+class StudioApiAuthTest(_StudioServerTestCase):
+    config_overrides = {
+        "auth_tokens": ("viewer-token",),
+        "operator_tokens": ("operator-token",),
+        "admin_tokens": ("admin-token",),
+    }
 
     def test_auth_required_for_api_get(self) -> None:
         missing = self._request("GET", "/api/health", allow_error=True)
@@ -615,7 +784,7 @@ class StudioApiAuthTest(unittest.TestCase):
 
     def test_post_requires_operator_role(self) -> None:
         payload = {
-            "plan": {"calls": [{"tool": "refua_validate_spec", "args": {}}]},
+            "plan": _VALIDATE_SPEC_PLAN,
             "max_calls": 10,
             "allow_skip_validate_first": False,
         }
@@ -653,7 +822,3 @@ class StudioApiAuthTest(unittest.TestCase):
             token="admin-token",
         )
         self.assertIn("deleted", allowed)
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import sys
 import tempfile
 import unittest
+from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
 from unittest import mock
@@ -12,16 +13,20 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
-from clawcures_ui.bridge import CampaignBridge
+from clawcures_ui.bridge import CampaignBridge, StudioBridgeError, _to_plain_data
 
 
 class CampaignBridgeTest(unittest.TestCase):
-    def setUp(self) -> None:
-        self.workspace_root = Path(__file__).resolve().parents[2]
-        self.bridge = CampaignBridge(self.workspace_root)
+    # The shared bridge is only read by these tests; tests that need fresh
+    # caches construct their own instance.
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.workspace_root = ROOT.parent
+        cls.bridge = CampaignBridge(cls.workspace_root)
 
-    def tearDown(self) -> None:
-        self.bridge.shutdown()
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.bridge.shutdown()
 
     def test_default_objective_is_non_empty(self) -> None:
         self.assertTrue(self.bridge.default_objective().strip())
@@ -77,6 +82,49 @@ class CampaignBridgeTest(unittest.TestCase):
         self.assertFalse(payload["approved"])
         self.assertGreaterEqual(len(payload["errors"]), 1)
 
+    def test_to_plain_data_converts_nested_values(self) -> None:
+        @dataclass
+        class Hit:
+            name: str
+            score: float
+
+        class Model:
+            def model_dump(self, *, mode: str) -> dict[str, str]:
+                return {"mode": mode}
+
+        payload = _to_plain_data(
+            {
+                "path": Path("/tmp/structure.cif"),
+                "hits": (Hit("a", 1.5), Hit("b", 2.0)),
+                "model": Model(),
+                3: [None, True, "x"],
+            }
+        )
+        self.assertEqual(
+            payload,
+            {
+                "path": "/tmp/structure.cif",
+                "hits": [{"name": "a", "score": 1.5}, {"name": "b", "score": 2.0}],
+                "model": {"mode": "json"},
+                "3": [None, True, "x"],
+            },
+        )
+
+    def test_to_plain_data_handles_deep_nesting(self) -> None:
+        nested: dict[str, object] = {}
+        cursor = nested
+        for _ in range(5000):
+            child: dict[str, object] = {}
+            cursor["child"] = (child,)
+            cursor = child
+
+        payload = _to_plain_data(nested)
+        depth = 0
+        while payload:
+            payload = payload["child"][0]
+            depth += 1
+        self.assertEqual(depth, 5000)
+
     def test_build_adapter_reuses_cached_instance(self) -> None:
         bridge = CampaignBridge(self.workspace_root)
         created: list[object] = []
@@ -104,6 +152,85 @@ class CampaignBridgeTest(unittest.TestCase):
         self.assertIs(first_adapter, second_adapter)
         self.assertEqual(len(created), 1)
 
+    def test_build_adapter_retries_failed_setup_after_invalidate(self) -> None:
+        bridge = CampaignBridge(self.workspace_root)
+        attempts: list[str] = []
+
+        def _failing_import(module_name: str) -> object:
+            attempts.append(module_name)
+            raise ModuleNotFoundError("refua_campaign")
+
+        with mock.patch.object(bridge, "_import", side_effect=_failing_import):
+            _adapter, first_error = bridge._build_adapter()
+            _adapter, second_error = bridge._build_adapter()
+            self.assertIsNotNone(first_error)
+            self.assertEqual(first_error, second_error)
+            self.assertEqual(len(attempts), 1)
+
+            bridge.invalidate_adapter()
+            bridge._build_adapter()
+            self.assertEqual(len(attempts), 2)
+
+            with mock.patch("clawcures_ui.bridge.time.monotonic", return_value=1e12):
+                bridge._build_adapter()
+            self.assertEqual(len(attempts), 3)
+
+    def test_available_tools_fallback_expires_with_failed_adapter(self) -> None:
+        bridge = CampaignBridge(self.workspace_root)
+
+        class FakeAdapter:
+            def available_tools(self) -> list[str]:
+                return ["refua_validate_spec"]
+
+        with mock.patch.object(
+            bridge, "_import", side_effect=ModuleNotFoundError("refua_campaign")
+        ):
+            _tools, warnings = bridge.available_tools()
+        self.assertEqual(len(warnings), 1)
+
+        recovered = SimpleNamespace(
+            DEFAULT_TOOL_LIST=("refua_validate_spec",),
+            RefuaMcpAdapter=FakeAdapter,
+        )
+        with mock.patch.object(bridge, "_import", return_value=recovered):
+            _tools, warnings = bridge.available_tools()
+            self.assertEqual(len(warnings), 1)
+
+            with mock.patch("clawcures_ui.bridge.time.monotonic", return_value=1e12):
+                _tools, warnings = bridge.available_tools()
+            self.assertEqual(warnings, [])
+
+    def test_live_runs_fail_before_planning_without_adapter(self) -> None:
+        for autonomous in (False, True):
+            with self.subTest(autonomous=autonomous):
+                bridge = CampaignBridge(self.workspace_root)
+                attempts: list[str] = []
+
+                def _failing_import(module_name: str) -> object:
+                    attempts.append(module_name)
+                    raise ModuleNotFoundError(module_name)
+
+                with mock.patch.object(bridge, "_import", side_effect=_failing_import):
+                    with self.assertRaises(StudioBridgeError):
+                        bridge.run(objective="x", autonomous=autonomous)
+                self.assertEqual(attempts, ["refua_campaign.refua_mcp_adapter"])
+
+    def test_invalid_plan_is_rejected_before_adapter_check(self) -> None:
+        for autonomous in (False, True):
+            with self.subTest(autonomous=autonomous):
+                bridge = CampaignBridge(self.workspace_root)
+                with mock.patch.object(
+                    bridge,
+                    "_import",
+                    side_effect=ModuleNotFoundError("refua_campaign"),
+                ):
+                    with self.assertRaisesRegex(ValueError, "plan must be a JSON object"):
+                        bridge.run(
+                            objective="x",
+                            plan=["not", "a", "dict"],  # type: ignore[arg-type]
+                            autonomous=autonomous,
+                        )
+
     def test_default_system_prompt_uses_mtime_cache(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             workspace_root = Path(tmp)
@@ -140,7 +267,3 @@ class CampaignBridgeTest(unittest.TestCase):
                 third = bridge._default_system_prompt()
                 self.assertEqual(third, "second prompt")
                 self.assertEqual(len(calls), 2)
-
-
-if __name__ == "__main__":
-    unittest.main()
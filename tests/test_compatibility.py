@@ -5,6 +5,7 @@ import sys
 import tomllib
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
@@ -41,17 +42,6 @@ class CompatibilityTest(unittest.TestCase):
         self.assertTrue(callable(create_server))
 
     def test_legacy_auth_env_vars_are_still_accepted(self) -> None:
-        previous = os.environ.get("REFUA_STUDIO_AUTH_TOKENS")
-        os.environ["REFUA_STUDIO_AUTH_TOKENS"] = " legacy-one , legacy-two "
-        try:
+        with mock.patch.dict(os.environ, {"REFUA_STUDIO_AUTH_TOKENS": " legacy-one , legacy-two "}):
             tokens = _resolve_tokens(None, env_names=("CLAWCURES_UI_AUTH_TOKENS", "REFUA_STUDIO_AUTH_TOKENS"))
-        finally:
-            if previous is None:
-                os.environ.pop("REFUA_STUDIO_AUTH_TOKENS", None)
-            else:
-                os.environ["REFUA_STUDIO_AUTH_TOKENS"] = previous
         self.assertEqual(tokens, ("legacy-one", "legacy-two"))
-
-
-if __name__ == "__main__":
-    unittest.main()
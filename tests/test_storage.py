@@ -5,7 +5,9 @@ import tempfile
 import threading
 import time
 import unittest
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
@@ -16,428 +18,507 @@ from clawcures_ui.storage import JobStore
 
 
 class JobStoreTest(unittest.TestCase):
-    def test_list_promising_drugs_aggregates_completed_job_results(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
+    def _require(self, job: dict[str, Any] | None) -> dict[str, Any]:
+        self.assertIsNotNone(job)
+        assert job is not None
+        return job
 
-            first = store.create_job(
-                kind="campaign_run",
-                request={"objective": "Prioritize KRAS G12D therapeutics"},
-            )
-            store.set_running(first["job_id"])
-            store.set_completed(
-                first["job_id"],
-                {
-                    "objective": "Prioritize KRAS G12D therapeutics",
-                    "promising_cures": [
-                        {
-                            "cure_id": "drug:lumatrol",
-                            "name": "Lumatrol",
-                            "target": "KRAS G12D",
-                            "smiles": "CCN(CC)C1=CC=CC=C1",
-                            "tool": "refua_affinity",
-                            "score": 82.4,
-                            "promising": True,
-                            "assessment": "Strong binding signal with favorable ADMET.",
-                            "metrics": {
-                                "binding_probability": 0.87,
-                                "admet_score": 0.74,
-                            },
-                            "admet": {
-                                "status": "favorable",
-                                "key_metrics": {"admet_score": 0.74},
-                                "properties": {"solubility": 0.61},
-                            },
-                            "tool_args": {"target": "KRAS G12D"},
+    def test_list_promising_drugs_aggregates_completed_job_results(self) -> None:
+        store = JobStore(":memory:")
+
+        first = store.create_job(
+            kind="campaign_run",
+            request={"objective": "Prioritize KRAS G12D therapeutics"},
+        )
+        store.set_running(first["job_id"])
+        store.set_completed(
+            first["job_id"],
+            {
+                "objective": "Prioritize KRAS G12D therapeutics",
+                "promising_cures": [
+                    {
+                        "cure_id": "drug:lumatrol",
+                        "name": "Lumatrol",
+                        "target": "KRAS G12D",
+                        "smiles": "CCN(CC)C1=CC=CC=C1",
+                        "tool": "refua_affinity",
+                        "score": 82.4,
+                        "promising": True,
+                        "assessment": "Strong binding signal with favorable ADMET.",
+                        "metrics": {
+                            "binding_probability": 0.87,
+                            "admet_score": 0.74,
                         },
-                        {
-                            "cure_id": "drug:heliomab",
-                            "name": "Heliomab",
-                            "target": "EGFR exon 20",
-                            "tool": "refua_affinity",
-                            "score": 56.2,
-                            "promising": False,
-                            "assessment": "Signal exists but potency needs more work.",
-                            "metrics": {"binding_probability": 0.49},
-                            "admet": {"status": "mixed"},
+                        "admet": {
+                            "status": "favorable",
+                            "key_metrics": {"admet_score": 0.74},
+                            "properties": {"solubility": 0.61},
                         },
-                    ],
-                },
-            )
-
-            second = store.create_job(
-                kind="plan_execute",
-                request={"objective": "Cross-check Lumatrol ADMET"},
-            )
-            store.set_running(second["job_id"])
-            store.set_completed(
-                second["job_id"],
-                {
-                    "objective": "Cross-check Lumatrol ADMET",
-                    "promising_cures": [
-                        {
-                            "cure_id": "drug:lumatrol",
-                            "name": "Lumatrol",
-                            "target": "KRAS G12D",
-                            "smiles": "CCN(CC)C1=CC=CC=C1",
-                            "tool": "refua_admet_profile",
-                            "score": 84.1,
-                            "promising": True,
-                            "assessment": "ADMET profile remains favorable after cross-check.",
-                            "metrics": {
-                                "binding_probability": 0.87,
+                        "tool_args": {"target": "KRAS G12D"},
+                    },
+                    {
+                        "cure_id": "drug:heliomab",
+                        "name": "Heliomab",
+                        "target": "EGFR exon 20",
+                        "tool": "refua_affinity",
+                        "score": 56.2,
+                        "promising": False,
+                        "assessment": "Signal exists but potency needs more work.",
+                        "metrics": {"binding_probability": 0.49},
+                        "admet": {"status": "mixed"},
+                    },
+                ],
+            },
+        )
+
+        second = store.create_job(
+            kind="plan_execute",
+            request={"objective": "Cross-check Lumatrol ADMET"},
+        )
+        store.set_running(second["job_id"])
+        store.set_completed(
+            second["job_id"],
+            {
+                "objective": "Cross-check Lumatrol ADMET",
+                "promising_cures": [
+                    {
+                        "cure_id": "drug:lumatrol",
+                        "name": "Lumatrol",
+                        "target": "KRAS G12D",
+                        "smiles": "CCN(CC)C1=CC=CC=C1",
+                        "tool": "refua_admet_profile",
+                        "score": 84.1,
+                        "promising": True,
+                        "assessment": "ADMET profile remains favorable after cross-check.",
+                        "metrics": {
+                            "binding_probability": 0.87,
+                            "admet_score": 0.79,
+                        },
+                        "admet": {
+                            "status": "favorable",
+                            "key_metrics": {
                                 "admet_score": 0.79,
+                                "safety_score": 0.83,
                             },
-                            "admet": {
-                                "status": "favorable",
-                                "key_metrics": {
-                                    "admet_score": 0.79,
-                                    "safety_score": 0.83,
-                                },
-                                "properties": {"solubility": 0.64},
-                            },
-                            "tool_args": {"candidate": "Lumatrol"},
-                        }
-                    ],
-                },
-            )
-
-            snapshot = store.list_promising_drugs(limit=20)
-
-            self.assertEqual(snapshot["summary"]["total_drugs"], 2)
-            self.assertEqual(snapshot["summary"]["promising_count"], 1)
-            self.assertEqual(snapshot["summary"]["watchlist_count"], 1)
-            self.assertEqual(snapshot["summary"]["source_jobs_count"], 2)
-            self.assertEqual(snapshot["summary"]["total_observations"], 3)
-            self.assertEqual(snapshot["facets"]["targets"], ["EGFR exon 20", "KRAS G12D"])
-            self.assertEqual(
-                snapshot["facets"]["tools"],
-                ["refua_admet_profile", "refua_affinity"],
-            )
-
-            first_drug = snapshot["drugs"][0]
-            self.assertEqual(first_drug["drug_id"], "drug:lumatrol")
-            self.assertEqual(first_drug["name"], "Lumatrol")
-            self.assertTrue(first_drug["promising"])
-            self.assertEqual(first_drug["seen_count"], 2)
-            self.assertEqual(first_drug["source_jobs_count"], 2)
-            self.assertEqual(first_drug["promising_runs"], 2)
-            self.assertEqual(
-                first_drug["tools"],
-                ["refua_admet_profile", "refua_affinity"],
-            )
-            self.assertEqual(first_drug["tool"], "refua_admet_profile")
-            self.assertEqual(first_drug["metrics"]["admet_score"], 0.79)
-            self.assertEqual(first_drug["sources"][0]["objective"], "Cross-check Lumatrol ADMET")
+                            "properties": {"solubility": 0.64},
+                        },
+                        "tool_args": {"candidate": "Lumatrol"},
+                    }
+                ],
+            },
+        )
+
+        snapshot = store.list_promising_drugs(limit=20)
+
+        self.assertEqual(snapshot["summary"]["total_drugs"], 2)
+        self.assertEqual(snapshot["summary"]["promising_count"], 1)
+        self.assertEqual(snapshot["summary"]["watchlist_count"], 1)
+        self.assertEqual(snapshot["summary"]["source_jobs_count"], 2)
+        self.assertEqual(snapshot["summary"]["total_observations"], 3)
+        self.assertEqual(snapshot["facets"]["targets"], ["EGFR exon 20", "KRAS G12D"])
+        self.assertEqual(
+            snapshot["facets"]["tools"],
+            ["refua_admet_profile", "refua_affinity"],
+        )
+
+        first_drug = snapshot["drugs"][0]
+        self.assertEqual(first_drug["drug_id"], "drug:lumatrol")
+        self.assertEqual(first_drug["name"], "Lumatrol")
+        self.assertTrue(first_drug["promising"])
+        self.assertEqual(first_drug["seen_count"], 2)
+        self.assertEqual(first_drug["source_jobs_count"], 2)
+        self.assertEqual(first_drug["promising_runs"], 2)
+        self.assertEqual(
+            first_drug["tools"],
+            ["refua_admet_profile", "refua_affinity"],
+        )
+        self.assertEqual(first_drug["tool"], "refua_admet_profile")
+        self.assertEqual(first_drug["metrics"]["admet_score"], 0.79)
+        self.assertEqual(first_drug["sources"][0]["objective"], "Cross-check Lumatrol ADMET")
 
     def test_create_and_update_job(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            created = store.create_job(kind="campaign_run", request={"objective": "x"})
-
-            self.assertEqual(created["status"], "queued")
-            job_id = created["job_id"]
-
-            store.set_running(job_id)
-            running = store.get_job(job_id)
-            self.assertIsNotNone(running)
-            assert running is not None
-            self.assertEqual(running["status"], "running")
-
-            store.set_completed(job_id, {"ok": True})
-            done = store.get_job(job_id)
-            self.assertIsNotNone(done)
-            assert done is not None
-            self.assertEqual(done["status"], "completed")
-            self.assertEqual(done["result"], {"ok": True})
+        store = JobStore(":memory:")
+        created = store.create_job(kind="campaign_run", request={"objective": "x"})
+
+        self.assertEqual(created["status"], "queued")
+        job_id = created["job_id"]
+
+        store.set_running(job_id)
+        running = self._require(store.get_job(job_id))
+        self.assertEqual(running["status"], "running")
+
+        store.set_completed(job_id, {"ok": True})
+        done = self._require(store.get_job(job_id))
+        self.assertEqual(done["status"], "completed")
+        self.assertEqual(done["result"], {"ok": True})
+
+    def test_lone_surrogates_are_stored_and_round_trip(self) -> None:
+        store = JobStore(":memory:")
+        text = "\ud800 x"
+        created = store.create_job(kind="campaign_run", request={"objective": text})
+        job_id = created["job_id"]
+        store.set_running(job_id)
+        store.record_event(job_id, event_type="note", summary="s", detail={"text": text})
+        self.assertTrue(store.set_completed(job_id, {"objective": text}))
+
+        done = self._require(store.get_job(job_id))
+        self.assertEqual(done["status"], "completed")
+        self.assertEqual(done["request"]["objective"], text)
+        self.assertEqual(done["result"]["objective"], text)
+        events = store.list_events(job_id=job_id, limit=10)
+        self.assertEqual(events[0]["detail"]["text"], text)
 
     def test_list_jobs_descending(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
+        store = JobStore(":memory:")
+        with store.transaction():
             first = store.create_job(kind="a", request={"i": 1})
             second = store.create_job(kind="b", request={"i": 2})
             store.set_completed(first["job_id"], {"one": 1})
             store.set_running(second["job_id"])
             store.set_failed(second["job_id"], "boom")
 
-            jobs = store.list_jobs(limit=10)
-            self.assertEqual(len(jobs), 2)
-            self.assertIn(jobs[0]["status"], {"failed", "completed"})
+        jobs = store.list_jobs(limit=10)
+        self.assertEqual(len(jobs), 2)
+        self.assertIn(jobs[0]["status"], {"failed", "completed"})
 
     def test_cancel_and_clear(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
+        store = JobStore(":memory:")
+        with store.transaction():
             queued = store.create_job(kind="queued", request={})
             done = store.create_job(kind="done", request={})
             store.set_running(done["job_id"])
             store.set_completed(done["job_id"], {"ok": 1})
 
-            cancelled = store.set_cancelled(queued["job_id"], "by test")
-            self.assertTrue(cancelled)
-            queued_row = store.get_job(queued["job_id"])
-            self.assertIsNotNone(queued_row)
-            assert queued_row is not None
-            self.assertEqual(queued_row["status"], "cancelled")
-
-            deleted = store.clear_jobs(statuses=("completed", "cancelled"))
-            self.assertEqual(deleted, 2)
-            self.assertEqual(store.list_jobs(limit=10), [])
+        cancelled = store.set_cancelled(queued["job_id"], "by test")
+        self.assertTrue(cancelled)
+        queued_row = self._require(store.get_job(queued["job_id"]))
+        self.assertEqual(queued_row["status"], "cancelled")
 
-    def test_recover_interrupted_jobs_cancels_active_rows(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            queued = store.create_job(kind="campaign_run", request={"objective": "queued"})
-            running = store.create_job(
-                kind="continuous_discovery_cycle",
-                request={"objective": "running"},
-            )
-            store.set_running(running["job_id"])
-            store.update_progress(
-                running["job_id"],
-                {
-                    "phase": "retry_wait",
-                    "summary": "Cycle 3 failed. Retrying in 5.0s.",
-                    "cycle_index": 3,
-                    "heartbeat_count": 4,
-                    "last_heartbeat_at": "2026-03-23T17:16:10.543055+00:00",
-                },
-            )
+        deleted = store.clear_jobs(statuses=("completed", "cancelled"))
+        self.assertEqual(deleted, 2)
+        self.assertEqual(store.list_jobs(limit=10), [])
 
-            recovered = store.recover_interrupted_jobs()
-            self.assertEqual(recovered, 2)
+    def test_transaction_rolls_back_every_write_on_error(self) -> None:
+        store = JobStore(":memory:")
+        kept = store.create_job(kind="kept", request={})
+        store.set_running(kept["job_id"])
 
-            queued_row = store.get_job(queued["job_id"])
-            self.assertIsNotNone(queued_row)
-            assert queued_row is not None
-            self.assertEqual(queued_row["status"], "cancelled")
-            self.assertEqual(queued_row["progress"]["phase"], "recovered")
+        with self.assertRaises(RuntimeError):
+            with store.transaction():
+                store.create_job(kind="discarded", request={})
+                store.request_cancel(kept["job_id"])
+                self.assertTrue(store.is_cancel_requested(kept["job_id"]))
+                raise RuntimeError("abort")
 
-            running_row = store.get_job(running["job_id"])
-            self.assertIsNotNone(running_row)
-            assert running_row is not None
-            self.assertEqual(running_row["status"], "cancelled")
-            self.assertTrue(running_row["cancel_requested"])
-            self.assertEqual(running_row["progress"]["phase"], "recovered")
-            self.assertEqual(running_row["progress"]["previous_phase"], "retry_wait")
-            self.assertIn("Studio restarted", running_row["error"])
+        self.assertEqual([job["kind"] for job in store.list_jobs(limit=10)], ["kept"])
+        self.assertFalse(store.is_cancel_requested(kept["job_id"]))
 
-    def test_wait_for_change_unblocks_after_write(self) -> None:
+    def test_is_cancel_requested_tracks_writes_and_reloads(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            initial_token = store.change_token()
-            seen_tokens: list[int] = []
+            path = Path(tmp) / "studio.db"
+            store = JobStore(path)
+            job = store.create_job(kind="campaign_run", request={})
+            store.set_running(job["job_id"])
+            self.assertFalse(store.is_cancel_requested(job["job_id"]))
 
-            def _waiter() -> None:
-                seen_tokens.append(store.wait_for_change(initial_token, timeout=1.0))
+            self.assertTrue(store.request_cancel(job["job_id"]))
+            self.assertTrue(store.is_cancel_requested(job["job_id"]))
 
-            thread = threading.Thread(target=_waiter)
-            thread.start()
-            time.sleep(0.05)
-            store.create_job(kind="campaign_run", request={"objective": "wake waiter"})
-            thread.join(timeout=2.0)
+            finished = store.create_job(kind="campaign_run", request={})
+            store.set_running(finished["job_id"])
+            store.request_cancel(finished["job_id"])
+            store.set_cancelled(finished["job_id"], "by test")
+            self.assertFalse(store.is_cancel_requested(finished["job_id"]))
+            store.shutdown()
 
-            self.assertFalse(thread.is_alive())
-            self.assertEqual(len(seen_tokens), 1)
-            self.assertGreater(seen_tokens[0], initial_token)
+            reopened = JobStore(path)
+            self.assertEqual(reopened._cancel_requested_ids, {job["job_id"]})
+            reopened.set_completed(job["job_id"], {"ok": True})
+            self.assertFalse(reopened.is_cancel_requested(job["job_id"]))
 
-    def test_update_progress_coalesces_pending_updates_until_flush(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            job = store.create_job(kind="continuous_discovery_cycle", request={"id": 9})
+    def test_prune_jobs_deletes_old_rows_in_batches(self) -> None:
+        store = JobStore(":memory:")
+        old_ids = []
+        for index in range(5):
+            job = store.create_job(kind="done", request={"index": index})
             store.set_running(job["job_id"])
-            token_before = store.change_token()
+            store.set_completed(job["job_id"], {"ok": index})
+            store.record_event(job["job_id"], event_type="done", summary="done")
+            old_ids.append(job["job_id"])
+        time.sleep(0.01)
+        cutoff = datetime.now(UTC).isoformat()
+        time.sleep(0.01)
+        fresh = store.create_job(kind="done", request={})
+        queued = store.create_job(kind="queued", request={})
+        store.set_running(fresh["job_id"])
+        store.set_completed(fresh["job_id"], {"ok": True})
+
+        deleted = store.prune_jobs(
+            statuses=("completed",),
+            updated_before=cutoff,
+            batch_size=2,
+        )
+
+        self.assertEqual(deleted, 5)
+        remaining = {job["job_id"] for job in store.list_jobs(limit=10)}
+        self.assertEqual(remaining, {fresh["job_id"], queued["job_id"]})
+        self.assertEqual(store.list_events(job_ids=old_ids), [])
 
-            self.assertTrue(
-                store.update_progress(
-                    job["job_id"],
-                    {
-                        "phase": "planning",
-                        "summary": "Cycle 9: planning.",
-                        "cycle_index": 9,
-                    },
-                )
-            )
-            self.assertTrue(
-                store.update_progress(
-                    job["job_id"],
-                    {
-                        "phase": "executing",
-                        "summary": "Cycle 9: executing.",
-                        "cycle_index": 9,
-                    },
-                )
-            )
+    def test_recover_interrupted_jobs_cancels_active_rows(self) -> None:
+        store = JobStore(":memory:")
+        queued = store.create_job(kind="campaign_run", request={"objective": "queued"})
+        running = store.create_job(
+            kind="continuous_discovery_cycle",
+            request={"objective": "running"},
+        )
+        store.set_running(running["job_id"])
+        store.update_progress(
+            running["job_id"],
+            {
+                "phase": "retry_wait",
+                "summary": "Cycle 3 failed. Retrying in 5.0s.",
+                "cycle_index": 3,
+                "heartbeat_count": 4,
+                "last_heartbeat_at": "2026-03-23T17:16:10.543055+00:00",
+            },
+        )
+
+        recovered = store.recover_interrupted_jobs()
+        self.assertEqual(recovered, 2)
+
+        queued_row = self._require(store.get_job(queued["job_id"]))
+        self.assertEqual(queued_row["status"], "cancelled")
+        self.assertEqual(queued_row["progress"]["phase"], "recovered")
+
+        running_row = self._require(store.get_job(running["job_id"]))
+        self.assertEqual(running_row["status"], "cancelled")
+        self.assertTrue(running_row["cancel_requested"])
+        self.assertEqual(running_row["progress"]["phase"], "recovered")
+        self.assertEqual(running_row["progress"]["previous_phase"], "retry_wait")
+        self.assertIn("Studio restarted", running_row["error"])
 
-            self.assertEqual(store.change_token(), token_before)
-            detail = store.get_job(job["job_id"])
-            self.assertIsNotNone(detail)
-            assert detail is not None
-            self.assertEqual(detail["progress"]["phase"], "executing")
-            self.assertEqual(detail["progress"]["summary"], "Cycle 9: executing.")
-            self.assertGreater(store.change_token(), token_before)
+    def test_wait_for_change_unblocks_after_write(self) -> None:
+        store = JobStore(":memory:")
+        initial_token = store.change_token()
+        seen_tokens: list[int] = []
+
+        def _waiter() -> None:
+            seen_tokens.append(store.wait_for_change(initial_token, timeout=1.0))
+
+        thread = threading.Thread(target=_waiter)
+        thread.start()
+        time.sleep(0.05)
+        store.create_job(kind="campaign_run", request={"objective": "wake waiter"})
+        thread.join(timeout=2.0)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(seen_tokens), 1)
+        self.assertGreater(seen_tokens[0], initial_token)
+
+    def test_wait_for_job_returns_on_matching_status(self) -> None:
+        store = JobStore(":memory:")
+        job_id = store.create_job(kind="campaign_run", request={})["job_id"]
+        store.set_running(job_id)
+
+        timer = threading.Timer(
+            0.05, store.set_completed, args=(job_id, {"ok": True})
+        )
+        timer.start()
+        job = self._require(
+            store.wait_for_job(job_id, statuses=("completed", "failed"), timeout=2.0)
+        )
+        timer.join()
+        self.assertEqual(job["status"], "completed")
+
+        timed_out = store.wait_for_job(job_id, statuses=("failed",), timeout=0.05)
+        self.assertEqual(timed_out["status"], "completed")
+        self.assertIsNone(
+            store.wait_for_job("missing", statuses=("completed",), timeout=1.0)
+        )
 
-    def test_job_event_callback_batches_until_read_flush(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            job = store.create_job(kind="campaign_run", request={"objective": "events"})
-            store.set_running(job["job_id"])
-            callback = store.job_event_callback(job["job_id"])
-            token_before = store.change_token()
+    def test_update_progress_coalesces_pending_updates_until_flush(self) -> None:
+        store = JobStore(":memory:")
+        job = store.create_job(kind="continuous_discovery_cycle", request={"id": 9})
+        store.set_running(job["job_id"])
+        token_before = store.change_token()
 
-            callback(
-                {
-                    "event_type": "tool_started",
-                    "summary": "First event",
-                    "level": "info",
-                    "detail": {"tool": "refua_validate_spec"},
-                }
-            )
-            callback(
+        self.assertTrue(
+            store.update_progress(
+                job["job_id"],
                 {
-                    "event_type": "tool_completed",
-                    "summary": "Second event",
-                    "level": "info",
-                    "detail": {"tool": "refua_validate_spec"},
-                }
+                    "phase": "planning",
+                    "summary": "Cycle 9: planning.",
+                    "cycle_index": 9,
+                },
             )
-
-            self.assertEqual(store.change_token(), token_before)
-            events = store.list_events(job_id=job["job_id"], limit=10)
-            self.assertEqual(len(events), 2)
-            self.assertEqual(events[0]["summary"], "Second event")
-            self.assertEqual(events[1]["summary"], "First event")
-            self.assertGreater(store.change_token(), token_before)
-
-    def test_shutdown_flushes_buffered_progress_and_events(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            job = store.create_job(kind="campaign_run", request={"objective": "flush"})
-            store.set_running(job["job_id"])
-            callback = store.job_event_callback(job["job_id"])
-
+        )
+        self.assertTrue(
             store.update_progress(
                 job["job_id"],
                 {
                     "phase": "executing",
-                    "summary": "Pending progress",
-                    "cycle_index": 1,
+                    "summary": "Cycle 9: executing.",
+                    "cycle_index": 9,
                 },
             )
-            callback(
-                {
-                    "event_type": "tool_completed",
-                    "summary": "Pending event",
-                    "detail": {"tool": "refua_affinity"},
-                }
-            )
+        )
 
-            store.shutdown()
-            detail = store.get_job(job["job_id"])
-            self.assertIsNotNone(detail)
-            assert detail is not None
-            self.assertEqual(detail["progress"]["summary"], "Pending progress")
-            events = store.list_events(job_id=job["job_id"], limit=10)
-            self.assertEqual(len(events), 1)
-            self.assertEqual(events[0]["summary"], "Pending event")
+        self.assertEqual(store.change_token(), token_before)
+        detail = self._require(store.get_job(job["job_id"]))
+        self.assertEqual(detail["progress"]["phase"], "executing")
+        self.assertEqual(detail["progress"]["summary"], "Cycle 9: executing.")
+        self.assertGreater(store.change_token(), token_before)
+
+    def test_job_event_callback_batches_until_read_flush(self) -> None:
+        store = JobStore(":memory:")
+        job = store.create_job(kind="campaign_run", request={"objective": "events"})
+        store.set_running(job["job_id"])
+        callback = store.job_event_callback(job["job_id"])
+        token_before = store.change_token()
+
+        callback(
+            {
+                "event_type": "tool_started",
+                "summary": "First event",
+                "level": "info",
+                "detail": {"tool": "refua_validate_spec"},
+            }
+        )
+        callback(
+            {
+                "event_type": "tool_completed",
+                "summary": "Second event",
+                "level": "info",
+                "detail": {"tool": "refua_validate_spec"},
+            }
+        )
+
+        self.assertEqual(store.change_token(), token_before)
+        events = store.list_events(job_id=job["job_id"], limit=10)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0]["summary"], "Second event")
+        self.assertEqual(events[1]["summary"], "First event")
+        self.assertGreater(store.change_token(), token_before)
+
+    def test_shutdown_flushes_buffered_progress_and_events(self) -> None:
+        store = JobStore(":memory:")
+        job = store.create_job(kind="campaign_run", request={"objective": "flush"})
+        store.set_running(job["job_id"])
+        callback = store.job_event_callback(job["job_id"])
+
+        store.update_progress(
+            job["job_id"],
+            {
+                "phase": "executing",
+                "summary": "Pending progress",
+                "cycle_index": 1,
+            },
+        )
+        callback(
+            {
+                "event_type": "tool_completed",
+                "summary": "Pending event",
+                "detail": {"tool": "refua_affinity"},
+            }
+        )
+
+        store.shutdown()
+        detail = self._require(store.get_job(job["job_id"]))
+        self.assertEqual(detail["progress"]["summary"], "Pending progress")
+        events = store.list_events(job_id=job["job_id"], limit=10)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["summary"], "Pending event")
 
     def test_list_jobs_cache_reused_until_revision_changes(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            first_job = store.create_job(kind="a", request={"i": 1})
-            store.set_running(first_job["job_id"])
-            store.set_completed(first_job["job_id"], {"ok": 1})
+        store = JobStore(":memory:")
+        first_job = store.create_job(kind="a", request={"i": 1})
+        store.set_running(first_job["job_id"])
+        store.set_completed(first_job["job_id"], {"ok": 1})
 
-            first = store.list_jobs(limit=10)
-            second = store.list_jobs(limit=10)
-            self.assertIs(first, second)
+        first = store.list_jobs(limit=10)
+        second = store.list_jobs(limit=10)
+        self.assertIs(first, second)
 
-            next_job = store.create_job(kind="b", request={"i": 2})
-            store.set_running(next_job["job_id"])
-            store.set_failed(next_job["job_id"], "boom")
+        next_job = store.create_job(kind="b", request={"i": 2})
+        store.set_running(next_job["job_id"])
+        store.set_failed(next_job["job_id"], "boom")
 
-            third = store.list_jobs(limit=10)
-            self.assertIsNot(first, third)
+        third = store.list_jobs(limit=10)
+        self.assertIsNot(first, third)
 
     def test_list_events_cache_reused_until_revision_changes(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            job = store.create_job(kind="campaign_run", request={"objective": "cache"})
-            store.set_running(job["job_id"])
-            store.record_event(job["job_id"], event_type="tool_started", summary="one")
+        store = JobStore(":memory:")
+        job = store.create_job(kind="campaign_run", request={"objective": "cache"})
+        store.set_running(job["job_id"])
+        store.record_event(job["job_id"], event_type="tool_started", summary="one")
 
-            first = store.list_events(job_id=job["job_id"], limit=10)
-            second = store.list_events(job_id=job["job_id"], limit=10)
-            self.assertIs(first, second)
+        first = store.list_events(job_id=job["job_id"], limit=10)
+        second = store.list_events(job_id=job["job_id"], limit=10)
+        self.assertIs(first, second)
 
-            store.record_event(job["job_id"], event_type="tool_completed", summary="two")
-            third = store.list_events(job_id=job["job_id"], limit=10)
-            self.assertIsNot(first, third)
-            self.assertEqual(third[0]["summary"], "two")
+        store.record_event(job["job_id"], event_type="tool_completed", summary="two")
+        third = store.list_events(job_id=job["job_id"], limit=10)
+        self.assertIsNot(first, third)
+        self.assertEqual(third[0]["summary"], "two")
 
     def test_status_counts_and_promising_drugs_cache_invalidate_on_revision(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            first_job = store.create_job(kind="campaign_run", request={"objective": "a"})
-            store.set_running(first_job["job_id"])
-            store.set_completed(
-                first_job["job_id"],
-                {
-                    "objective": "a",
-                    "promising_cures": [
-                        {
-                            "cure_id": "drug:a",
-                            "name": "Drug A",
-                            "tool": "refua_affinity",
-                            "score": 75,
-                            "promising": True,
-                        }
-                    ],
-                },
-            )
-
-            counts_one = store.status_counts()
-            counts_two = store.status_counts()
-            self.assertEqual(counts_one, counts_two)
-
-            promising_one = store.list_promising_drugs(limit=20)
-            promising_two = store.list_promising_drugs(limit=20)
-            self.assertIs(promising_one, promising_two)
-
-            second_job = store.create_job(kind="campaign_run", request={"objective": "b"})
-            store.set_running(second_job["job_id"])
-            store.set_failed(second_job["job_id"], "boom")
-
-            counts_three = store.status_counts()
-            self.assertNotEqual(counts_one, counts_three)
-            promising_three = store.list_promising_drugs(limit=20)
-            self.assertIsNot(promising_one, promising_three)
+        store = JobStore(":memory:")
+        first_job = store.create_job(kind="campaign_run", request={"objective": "a"})
+        store.set_running(first_job["job_id"])
+        store.set_completed(
+            first_job["job_id"],
+            {
+                "objective": "a",
+                "promising_cures": [
+                    {
+                        "cure_id": "drug:a",
+                        "name": "Drug A",
+                        "tool": "refua_affinity",
+                        "score": 75,
+                        "promising": True,
+                    }
+                ],
+            },
+        )
+
+        counts_one = store.status_counts()
+        counts_two = store.status_counts()
+        self.assertEqual(counts_one, counts_two)
+
+        promising_one = store.list_promising_drugs(limit=20)
+        promising_two = store.list_promising_drugs(limit=20)
+        self.assertIs(promising_one, promising_two)
+
+        second_job = store.create_job(kind="campaign_run", request={"objective": "b"})
+        store.set_running(second_job["job_id"])
+        store.set_failed(second_job["job_id"], "boom")
+
+        counts_three = store.status_counts()
+        self.assertNotEqual(counts_one, counts_three)
+        promising_three = store.list_promising_drugs(limit=20)
+        self.assertIsNot(promising_one, promising_three)
 
     def test_status_counts_cache_avoids_repeat_query_until_revision_changes(self) -> None:
-        with tempfile.TemporaryDirectory() as tmp:
-            store = JobStore(Path(tmp) / "studio.db")
-            job = store.create_job(kind="campaign_run", request={"objective": "count"})
-            store.set_running(job["job_id"])
-            store.set_completed(job["job_id"], {"ok": True})
-
-            counts_queries = 0
-
-            def _trace(sql: str) -> None:
-                nonlocal counts_queries
-                if "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status" in sql:
-                    counts_queries += 1
-
-            store._conn.set_trace_callback(_trace)
-            try:
-                store.status_counts()
-                store.status_counts()
-                self.assertEqual(counts_queries, 1)
-                extra = store.create_job(kind="campaign_run", request={"objective": "new"})
-                store.set_running(extra["job_id"])
-                store.status_counts()
-                self.assertEqual(counts_queries, 2)
-            finally:
-                store._conn.set_trace_callback(None)
-
-
-if __name__ == "__main__":
-    unittest.main()
+        store = JobStore(":memory:")
+        job = store.create_job(kind="campaign_run", request={"objective": "count"})
+        store.set_running(job["job_id"])
+        store.set_completed(job["job_id"], {"ok": True})
+
+        counts_queries = 0
+
+        def _trace(sql: str) -> None:
+            nonlocal counts_queries
+            if "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status" in sql:
+                counts_queries += 1
+
+        store._conn.set_trace_callback(_trace)
+        try:
+            store.status_counts()
+            store.status_counts()
+            self.assertEqual(counts_queries, 1)
+            extra = store.create_job(kind="campaign_run", request={"objective": "new"})
+            store.set_running(extra["job_id"])
+            store.status_counts()
+            self.assertEqual(counts_queries, 2)
+        finally:
+            store._conn.set_trace_callback(None)